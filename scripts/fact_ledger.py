@@ -15,11 +15,98 @@ Usage:
 
 import argparse
 import json
+import operator
 import sys
 import re
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import ijson  # Optional: streaming parser for very large facts files
+except ImportError:
+    ijson = None
+
+try:
+    import numba  # Optional: JIT-compile the numeric normalization hot path
+except ImportError:
+    numba = None
+
+# Unit codes passed to _normalize; integer codes keep the function
+# compilable by numba (string branching is not nopython-friendly).
+_UNIT_NONE = 0
+_UNIT_BILLION = 1
+_UNIT_MILLION = 2
+_UNIT_THOUSAND = 3
+_UNIT_TRILLION = 4
+
+
+# Scale-to-billions factors indexed by unit code: NONE, BILLION, MILLION,
+# THOUSAND, TRILLION. Bare values keep their raw magnitude.
+_SCALE_TO_BILLIONS = (1.0, 1.0, 1e-3, 1e-6, 1e3)
+
+
+def _normalize(raw: float, unit_code: int) -> float:
+    """Scale a raw currency magnitude to billions for consistent storage.
+
+    Free function (not a method) so it can be JIT-compiled; regex-based
+    classification stays in parse_value, only the numeric post-processing
+    is lowered here. Branchless: one indexed load and one multiply.
+
+    Args:
+        raw: Numeric value as written (e.g. 22.4 for "$22.4B")
+        unit_code: One of the _UNIT_* codes
+
+    Returns:
+        Value normalized to billions (bare values stay raw)
+    """
+    return raw * _SCALE_TO_BILLIONS[unit_code]
+
+
+if numba is not None:
+    _normalize = numba.njit(cache=True)(_normalize)
+    # Warm-compile at import so JIT cost never lands on the ingest hot path
+    _normalize(1.0, _UNIT_BILLION)
+
+# Currency suffix -> (unit code, unit label); one hash lookup replaces the
+# four-branch comparison ladder per row
+_UNIT_TABLE = {
+    "B": (_UNIT_BILLION, "USD billion"),
+    "BILLION": (_UNIT_BILLION, "USD billion"),
+    "M": (_UNIT_MILLION, "USD million"),
+    "MILLION": (_UNIT_MILLION, "USD million"),
+    "K": (_UNIT_THOUSAND, "USD thousand"),
+    "THOUSAND": (_UNIT_THOUSAND, "USD thousand"),
+    "T": (_UNIT_TRILLION, "USD trillion"),
+    "TRILLION": (_UNIT_TRILLION, "USD trillion"),
+}
+
+# Date formats recognized by parse_value, compiled once at import
+_DATE_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")  # 2024-01-15
+_DATE_YEAR_RE = re.compile(r"^\d{4}$")  # 2024
+_DATE_MONTH_NAME_RE = re.compile(
+    r"^(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}$",
+    re.IGNORECASE,
+)
+
+# O(1) prefilter for the month-name pattern: reject values whose first three
+# characters cannot start a month before walking the 12-way alternation.
+_MONTH_PREFIXES = frozenset(
+    {"Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"}
+)
+
+# Files larger than this are parsed incrementally (when ijson is available)
+# so ingest can start before the whole document is materialized.
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+STREAMING_CHUNK_SIZE = 10_000
+
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most `size` items from an iterable."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -57,37 +144,16 @@ class FactLedger:
         )
         if currency_match:
             num_str = currency_match.group(1).replace(",", "")
-            multiplier = 1.0
             unit_suffix = currency_match.group(2)
             if unit_suffix:
-                unit_suffix = unit_suffix.upper()
-                if unit_suffix in ("B", "BILLION"):
-                    multiplier = 1e9
-                    unit = "USD billion"
-                elif unit_suffix in ("M", "MILLION"):
-                    multiplier = 1e6
-                    unit = "USD million"
-                elif unit_suffix in ("K", "THOUSAND"):
-                    multiplier = 1e3
-                    unit = "USD thousand"
-                elif unit_suffix in ("T", "TRILLION"):
-                    multiplier = 1e12
-                    unit = "USD trillion"
-                else:
-                    unit = "USD"
+                unit_code, unit = _UNIT_TABLE.get(
+                    unit_suffix.upper(), (_UNIT_NONE, "USD")
+                )
             else:
-                unit = "USD"
+                unit_code, unit = _UNIT_NONE, "USD"
             try:
-                numeric = float(num_str)
                 # Store in billions for consistency
-                if multiplier >= 1e9:
-                    numeric = numeric
-                elif multiplier == 1e6:
-                    numeric = numeric / 1000
-                elif multiplier == 1e3:
-                    numeric = numeric / 1e6
-                elif multiplier == 1e12:
-                    numeric = numeric * 1000
+                numeric = _normalize(float(num_str), unit_code)
                 return numeric, "currency", unit
             except ValueError:
                 pass
@@ -102,14 +168,10 @@ class FactLedger:
                 pass
 
         # Date patterns
-        date_patterns = [
-            r"^\d{4}-\d{2}-\d{2}$",  # 2024-01-15
-            r"^\d{4}$",  # 2024
-            r"^(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}$",
-        ]
-        for pattern in date_patterns:
-            if re.match(pattern, value, re.IGNORECASE):
-                return None, "date", None
+        if _DATE_ISO_RE.match(value) or _DATE_YEAR_RE.match(value):
+            return None, "date", None
+        if value[:3].title() in _MONTH_PREFIXES and _DATE_MONTH_NAME_RE.match(value):
+            return None, "date", None
 
         # Plain number
         plain_match = re.match(r"^([\d,.]+)$", value)
@@ -135,66 +197,149 @@ class FactLedger:
         Returns:
             Summary of created facts
         """
+        created = 0
+        total = 0
+        errors = []
+
+        # Bind once; avoids an attribute lookup per fact in the hot loop
+        create_fact = self._create_fact
+
+        for chunk in _chunked(self._iter_facts(facts_file), STREAMING_CHUNK_SIZE):
+            for fact in chunk:
+                i = total
+                total += 1
+                try:
+                    create_fact(session_id, fact)
+                    created += 1
+                except Exception as e:
+                    # Keep only identifying fields; referencing the full fact
+                    # would pin its source excerpts in memory for the whole run
+                    errors.append(
+                        {
+                            "index": i,
+                            "error": str(e),
+                            "entity": fact.get("entity"),
+                            "attribute": fact.get("attribute"),
+                        }
+                    )
+
+        return {
+            "created": created,
+            "total": total,
+            "errors": errors,
+        }
+
+    def _iter_facts(self, facts_file: str) -> Iterator[Dict[str, Any]]:
+        """Iterate facts from a JSON file, streaming large files when possible.
+
+        Files above STREAMING_THRESHOLD_BYTES are parsed incrementally with
+        ijson (if installed) so peak memory stays O(chunk) instead of
+        O(file size). Smaller files use json.load as before.
+
+        Args:
+            facts_file: Path to JSON file containing facts
+
+        Yields:
+            Fact dictionaries
+        """
+        file_size = Path(facts_file).stat().st_size
+
+        if ijson is not None and file_size > STREAMING_THRESHOLD_BYTES:
+            with open(facts_file, "rb") as f:
+                # Detect top-level structure: array vs object with "facts" key
+                prefix = f.read(64).lstrip()
+                f.seek(0)
+                item_path = "item" if prefix.startswith(b"[") else "facts.item"
+                yield from ijson.items(f, item_path)
+            return
+
         with open(facts_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
         # Handle both array and object with "facts" key
         facts_list = data if isinstance(data, list) else data.get("facts", [])
+        yield from facts_list
 
-        created = 0
-        errors = []
+    def _create_fact(self, session_id: str, fact: Dict[str, Any]) -> int:
+        """Create a single fact (plus its source) from a fact dictionary.
 
-        for i, fact in enumerate(facts_list):
-            try:
-                # Parse value to get numeric and type
-                value = fact.get("value", "")
-                numeric, value_type, unit = self.parse_value(value)
-
-                # Override with provided values if present
-                if "value_type" in fact:
-                    value_type = fact["value_type"]
-                if "value_numeric" in fact:
-                    numeric = fact["value_numeric"]
-                if "unit" in fact:
-                    unit = fact["unit"]
-
-                # Create fact
-                fact_id = self.state_manager.create_fact(
-                    session_id=session_id,
-                    entity=fact.get("entity", "Unknown"),
-                    attribute=fact.get("attribute", "Unknown"),
-                    value=value,
-                    value_type=value_type,
-                    value_numeric=numeric,
-                    unit=unit,
-                    confidence=fact.get("confidence", "Medium"),
-                    context=fact.get("context"),
-                )
+        Args:
+            session_id: Research session ID
+            fact: Fact dictionary from the input file
 
-                # Add source if present
-                source = fact.get("source", {})
-                if source and isinstance(source, dict):
-                    self.state_manager.add_fact_source(
-                        fact_id=fact_id,
-                        source_url=source.get("url", ""),
-                        source_title=source.get("title"),
-                        source_author=source.get("author"),
-                        source_date=source.get("date"),
-                        source_quality=source.get("quality"),
-                        page_number=source.get("page_number"),
-                        excerpt=source.get("excerpt"),
-                    )
+        Returns:
+            Created fact ID
+        """
+        # Parse value to get numeric and type
+        value = fact.get("value", "")
+        numeric, value_type, unit = self.parse_value(value)
+
+        # Override with provided values if present
+        if "value_type" in fact:
+            value_type = fact["value_type"]
+        if "value_numeric" in fact:
+            numeric = fact["value_numeric"]
+        if "unit" in fact:
+            unit = fact["unit"]
+
+        # Create fact
+        fact_id = self.state_manager.create_fact(
+            session_id=session_id,
+            entity=fact.get("entity", "Unknown"),
+            attribute=fact.get("attribute", "Unknown"),
+            value=value,
+            value_type=value_type,
+            value_numeric=numeric,
+            unit=unit,
+            confidence=fact.get("confidence", "Medium"),
+            context=fact.get("context"),
+        )
 
-                created += 1
+        # Add source if present
+        source = fact.get("source", {})
+        if source and isinstance(source, dict):
+            self.state_manager.add_fact_source(
+                fact_id=fact_id,
+                source_url=source.get("url", ""),
+                source_title=source.get("title"),
+                source_author=source.get("author"),
+                source_date=source.get("date"),
+                source_quality=source.get("quality"),
+                page_number=source.get("page_number"),
+                excerpt=source.get("excerpt"),
+            )
 
-            except Exception as e:
-                errors.append({"index": i, "error": str(e), "fact": fact})
+        return fact_id
 
-        return {
-            "created": created,
-            "total": len(facts_list),
-            "errors": errors,
-        }
+    def create_facts_batch(
+        self, session_id: str, facts_files: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Create facts from multiple JSON files sharing one ledger instance.
+
+        Amortizes process startup and database-connection setup across many
+        imports: one StateManager connection serves every file instead of one
+        process (and one SQLite open) per file.
+
+        Args:
+            session_id: Research session ID
+            facts_files: Paths to JSON files containing facts
+
+        Returns:
+            Mapping of file path to per-file creation summary
+        """
+        results = {}
+        for facts_file in facts_files:
+            try:
+                results[facts_file] = self.create_facts_from_json(
+                    session_id, facts_file
+                )
+            except Exception as e:
+                results[facts_file] = {
+                    "created": 0,
+                    "total": 0,
+                    "errors": [{"index": -1, "error": str(e)}],
+                }
+        return results
 
     def query_facts(
         self,
@@ -279,9 +424,12 @@ class FactLedger:
             "|--------|-----------|-------|--------|---------|",
         ]
 
+        # Single C-level tuple fetch per row instead of five dict lookups
+        stat_ig = operator.itemgetter("entity", "attribute", "value", "source", "quality")
         for stat in stats["statistics"]:
+            entity, attribute, value, source, quality = stat_ig(stat)
             lines.append(
-                f"| {stat['entity']} | {stat['attribute']} | {stat['value']} | {stat['source']} | {stat['quality']} |"
+                f"| {entity} | {attribute} | {value} | {source} | {quality} |"
             )
 
         # Add conflicts section if any
@@ -348,21 +496,38 @@ class FactLedger:
 
         lines = ["entity,attribute,value,value_type,value_numeric,unit,confidence,context,source_url,source_author,source_quality"]
 
+        # One C-level tuple fetch per row instead of ~8 dict.get frames
+        keys = (
+            "entity",
+            "attribute",
+            "value",
+            "value_type",
+            "value_numeric",
+            "unit",
+            "confidence",
+            "context",
+        )
+        row_ig = operator.itemgetter(*keys)
+
         for fact in facts:
-            source = fact.get("sources", [{}])[0] if fact.get("sources") else {}
+            entity, attribute, value, value_type, numeric, unit, confidence, context = (
+                "" if v is None else v for v in row_ig(fact)
+            )
+            source = (fact.get("sources") or ({},))[0]
+            src_get = source.get
             line = ",".join(
                 [
-                    f'"{fact.get("entity", "")}"',
-                    f'"{fact.get("attribute", "")}"',
-                    f'"{fact.get("value", "")}"',
-                    f'"{fact.get("value_type", "")}"',
-                    str(fact.get("value_numeric", "")),
-                    f'"{fact.get("unit", "")}"',
-                    f'"{fact.get("confidence", "")}"',
-                    f'"{fact.get("context", "")}"',
-                    f'"{source.get("source_url", "")}"',
-                    f'"{source.get("source_author", "")}"',
-                    f'"{source.get("source_quality", "")}"',
+                    f'"{entity}"',
+                    f'"{attribute}"',
+                    f'"{value}"',
+                    f'"{value_type}"',
+                    str(numeric),
+                    f'"{unit}"',
+                    f'"{confidence}"',
+                    f'"{context}"',
+                    f'"{src_get("source_url", "")}"',
+                    f'"{src_get("source_author", "")}"',
+                    f'"{src_get("source_quality", "")}"',
                 ]
             )
             lines.append(line)
@@ -404,6 +569,27 @@ Examples:
         "--db", help="Path to SQLite database", default=None
     )
 
+    # Batch command
+    batch_parser = subparsers.add_parser(
+        "batch", help="Create facts from many JSON files in one process"
+    )
+    batch_parser.add_argument("session_id", help="Research session ID")
+    batch_parser.add_argument(
+        "facts_files", nargs="+", help="Paths to JSON files containing facts"
+    )
+    batch_parser.add_argument(
+        "--db", help="Path to SQLite database", default=None
+    )
+
+    # REPL command
+    repl_parser = subparsers.add_parser(
+        "repl",
+        help="Read '<session_id> <facts_file>' pairs from stdin, one per line",
+    )
+    repl_parser.add_argument(
+        "--db", help="Path to SQLite database", default=None
+    )
+
     # Query command
     query_parser = subparsers.add_parser("query", help="Query facts")
     query_parser.add_argument("session_id", help="Research session ID")
@@ -466,6 +652,35 @@ Examples:
                 for err in result["errors"][:5]:  # Show first 5 errors
                     print(f"  - Index {err['index']}: {err['error']}")
 
+        elif args.command == "batch":
+            results = ledger.create_facts_batch(args.session_id, args.facts_files)
+            for facts_file, result in results.items():
+                print(
+                    f"{facts_file}: created {result['created']}/{result['total']} facts"
+                    + (f", {len(result['errors'])} error(s)" if result["errors"] else "")
+                )
+
+        elif args.command == "repl":
+            # One long-lived process serving many imports; callers (e.g. Make
+            # pipelines) pipe "<session_id> <facts_file>" lines to stdin.
+            for line in sys.stdin:
+                line = line.strip()
+                if not line:
+                    continue
+                parts = line.split(maxsplit=1)
+                if len(parts) != 2:
+                    print(f"skipped (expected '<session_id> <facts_file>'): {line}")
+                    continue
+                repl_session, facts_file = parts
+                try:
+                    result = ledger.create_facts_from_json(repl_session, facts_file)
+                    print(
+                        f"{facts_file}: created {result['created']}/{result['total']} facts"
+                    )
+                except Exception as e:
+                    print(f"{facts_file}: error - {e}")
+                sys.stdout.flush()
+
         elif args.command == "query":
             facts = ledger.query_facts(
                 session_id=args.session_id,
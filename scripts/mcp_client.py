@@ -0,0 +1,1189 @@
+#!/usr/bin/env python3
+"""
+MCP Client for Deep Research Agent
+
+Python-side client for the Node MCP server in .claude/mcp-server, which
+exposes the fact-extract / entity-extract / citation-validate / source-rate /
+conflict-detect tools (plus their batch variants) over JSON-RPC on stdio.
+
+Two transports are provided:
+
+- MCPClient (v1): compatibility transport. Calls are served by a small pool
+  of long-lived node workers, so only the first call per worker pays the
+  spawn + module-load cost. Kept so existing callers keep working.
+- MCPClientV2: persistent connection. The server process is spawned once and
+  reused; a background reader thread routes responses to waiting callers by
+  request id, so each call pays only the RPC round trip (~50 ms).
+
+Usage:
+    # One-off tool call (persistent transport)
+    python3 scripts/mcp_client.py call fact-extract '{"text": "..."}'
+
+    # Compare call overhead across a batch of texts
+    python3 scripts/mcp_client.py benchmark
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import io
+import itertools
+import json
+import logging
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson  # Optional: C JSON parser for the RPC hot path
+except ImportError:
+    orjson = None
+
+try:
+    import ormsgpack  # Optional: MessagePack wire encoding (opt-in)
+except ImportError:
+    ormsgpack = None
+
+try:
+    import simdjson  # Optional: lazy parsing for projected responses
+except ImportError:
+    simdjson = None
+
+if orjson is not None:
+    # Both helpers speak bytes: the pipes are binary, so no text-mode decode
+    # pass runs between the pipe and the parser. orjson.JSONDecodeError
+    # subclasses ValueError, same as json.JSONDecodeError, so one except
+    # clause covers both parsers
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps_line(obj) -> bytes:
+        # OPT_APPEND_NEWLINE writes the delimiter into orjson's own output
+        # buffer: one allocation per request instead of dumps + concat copy
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _canonical_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+else:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps_line(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8") + b"\n"
+
+    def _canonical_dumps(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode("utf-8")
+
+
+logger = logging.getLogger(__name__)
+
+# Text fields above this size ship as a raw binary segment after the JSON
+# header instead of a JSON-embedded (escaped) string
+_BLOB_THRESHOLD = 4096
+
+# Built MCP server entry point, relative to the repo root
+DEFAULT_SERVER_SCRIPT = (
+    Path(__file__).resolve().parent.parent
+    / ".claude" / "mcp-server" / "dist" / "index.js"
+)
+
+
+def _project_obj(data: Any, pointers: List[str]) -> Dict[str, Any]:
+    """Resolve JSON pointers against an already-parsed object."""
+    projected = {}
+    for pointer in pointers:
+        node = data
+        try:
+            for part in pointer.split("/"):
+                if not part:
+                    continue
+                node = node[int(part)] if isinstance(node, list) else node[part]
+            projected[pointer] = node
+        except (KeyError, IndexError, TypeError, ValueError):
+            projected[pointer] = None
+    return projected
+
+
+def _project_lazy(text, pointers: List[str]) -> Dict[str, Any]:
+    """Resolve JSON pointers from raw JSON, materializing only those nodes.
+
+    simdjson parses the document lazily, so untouched facts/entities in a
+    large batch response never become Python objects.
+    """
+    document = simdjson.Parser().parse(text)
+    projected = {}
+    for pointer in pointers:
+        try:
+            node = document.at_pointer(pointer)
+        except (KeyError, IndexError, TypeError, ValueError):
+            projected[pointer] = None
+            continue
+        if isinstance(node, simdjson.Object):
+            node = node.as_dict()
+        elif isinstance(node, simdjson.Array):
+            node = node.as_list()
+        projected[pointer] = node
+    return projected
+
+
+def _unwrap_result(result: Any, projection: Optional[List[str]] = None) -> Any:
+    """Unwrap the MCP TextContent convention.
+
+    Tool handlers return their JSON body as a string inside
+    result.content[0].text; decode it so callers get a plain dict. A
+    structured-results server skips that wrapping and parks the object
+    directly under result.data, saving the second JSON parse entirely.
+    With a projection, only the requested JSON-pointer nodes are
+    materialized (lazily when simdjson is installed).
+    """
+    if isinstance(result, dict):
+        if "data" in result and "content" not in result:
+            data = result["data"]
+            return _project_obj(data, projection) if projection else data
+        content = result.get("content")
+        if isinstance(content, list) and content:
+            text = content[0].get("text")
+            if text is not None:
+                if projection and simdjson is not None:
+                    try:
+                        return _project_lazy(text, projection)
+                    except ValueError:
+                        return text
+                try:
+                    parsed = _loads(text)
+                except ValueError:
+                    return text
+                return _project_obj(parsed, projection) if projection else parsed
+    return result
+
+
+class MCPClient:
+    """Legacy MCP client (v1), now backed by warm workers.
+
+    Historically every call ran a throwaway node process via
+    subprocess.run — fork, module load, handshake, teardown, about a
+    second per call. The public signature is unchanged, but calls now go
+    onto a queue drained by a small pool of long-lived node workers
+    speaking the same newline JSON-RPC protocol, so only the first call
+    per worker pays the spawn cost. Prefer MCPClientV2 for new code.
+    """
+
+    _POOL_SIZE = 2
+
+    def __init__(self, server_script: Optional[str] = None, timeout: float = 30.0):
+        self.server_script = Path(server_script) if server_script else DEFAULT_SERVER_SCRIPT
+        self.timeout = timeout
+        self._next_id = itertools.count(1)
+        # Pool state is built lazily on the first call so constructing a
+        # client (e.g. in a fixture) stays free
+        self._task_q: Optional[queue.Queue] = None
+        self._pool_lock = threading.Lock()
+        self._worker_procs: Dict[int, subprocess.Popen] = {}
+        self._closed = False
+
+    def _ensure_pool(self):
+        """Start the worker threads on first use."""
+        if self._task_q is not None:
+            return
+        with self._pool_lock:
+            if self._task_q is not None:
+                return
+            task_q: queue.Queue = queue.Queue()
+            for worker_id in range(self._POOL_SIZE):
+                threading.Thread(
+                    target=self._worker_loop,
+                    args=(worker_id, task_q),
+                    daemon=True,
+                ).start()
+            self._task_q = task_q
+
+    def _spawn_worker(self) -> tuple:
+        """Spawn one node worker and complete the initialize handshake."""
+        process = subprocess.Popen(
+            ["node", str(self.server_script)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            # Nothing reads worker stderr; piping it would eventually
+            # block the worker once the pipe buffer fills
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        reader = io.BufferedReader(process.stdout, buffer_size=1 << 20)
+        process.stdin.write(_dumps_line({
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "mcp_client", "version": "1.0"},
+            },
+        }))
+        process.stdin.flush()
+        self._read_until(reader, 0)
+        return process, reader
+
+    @staticmethod
+    def _read_until(reader, request_id: int) -> Dict[str, Any]:
+        """Read newline-JSON lines until the response with request_id."""
+        while True:
+            line = reader.readline()
+            if not line:
+                raise RuntimeError("MCP worker exited mid-call")
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                response = _loads(line)
+            except ValueError:
+                continue  # server log output, not protocol
+            if isinstance(response, dict) and response.get("id") == request_id:
+                return response
+
+    def _worker_loop(self, worker_id: int, task_q: queue.Queue):
+        """Worker thread: one warm node process serving queued calls."""
+        process = reader = None
+        while not self._closed:
+            task = task_q.get()
+            if task is None:
+                break
+            tool_name, arguments, slot = task
+            try:
+                if process is None or process.poll() is not None:
+                    process, reader = self._spawn_worker()
+                    self._worker_procs[worker_id] = process
+                request_id = next(self._next_id)
+                process.stdin.write(_dumps_line({
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": "tools/call",
+                    "params": {"name": tool_name, "arguments": arguments},
+                }))
+                process.stdin.flush()
+                slot[0] = ("ok", self._read_until(reader, request_id))
+            except Exception as e:
+                # Don't trust a worker that failed mid-protocol: kill it
+                # and let the next task respawn fresh
+                if process is not None:
+                    process.kill()
+                    process = reader = None
+                    self._worker_procs.pop(worker_id, None)
+                slot[0] = ("err", e)
+            slot[1].set()
+        if process is not None:
+            process.kill()
+            self._worker_procs.pop(worker_id, None)
+
+    def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Run one tool call on a warm pooled worker."""
+        self._ensure_pool()
+        slot = [None, threading.Event()]
+        self._task_q.put((tool_name, arguments, slot))
+        if not slot[1].wait(timeout=self.timeout):
+            raise TimeoutError(f"MCP request timed out: {tool_name}")
+        status, value = slot[0]
+        if status == "err":
+            raise value
+        if "error" in value:
+            raise RuntimeError(f"MCP error: {value['error']}")
+        return _unwrap_result(value.get("result"))
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Async-compatible wrapper around the pooled transport."""
+        return self._call_tool(tool_name, arguments)
+
+    def close(self):
+        """Stop the worker threads and kill their node processes."""
+        self._closed = True
+        if self._task_q is not None:
+            for _ in range(self._POOL_SIZE):
+                self._task_q.put(None)
+        for process in list(self._worker_procs.values()):
+            process.kill()
+        self._worker_procs.clear()
+
+
+class MCPClientV2:
+    """Persistent MCP client (v2).
+
+    Spawns the Node server once and keeps the JSON-RPC-over-stdio connection
+    open. A daemon reader thread parses responses and hands each one to the
+    caller waiting on its request id.
+    """
+
+    # Coalesced single-call kinds and their server-side batch tools
+    _BATCH_TOOLS = {
+        "fact": "batch-fact-extract",
+        "entity": "batch-entity-extract",
+    }
+
+    # Tools whose results must never be served from the client cache
+    _UNCACHEABLE_TOOLS = frozenset({"cache-stats", "cache-clear"})
+
+    def __init__(
+        self,
+        server_script: Optional[str] = None,
+        timeout: float = 30.0,
+        max_batch: int = 16,
+        max_delay_ms: float = 5.0,
+        cache_size: int = 256,
+        encoding: str = "json",
+        # Newline-delimited JSON is what the in-repo server speaks; the
+        # length-prefix framing (and the msgpack/__blob paths it gates) is
+        # strictly opt-in for servers that actually support it
+        framing: str = "newline",
+    ):
+        if encoding not in ("json", "msgpack"):
+            raise ValueError(f"Unknown encoding: {encoding}")
+        if framing not in ("newline", "length-prefix"):
+            raise ValueError(f"Unknown framing: {framing}")
+        self.server_script = Path(server_script) if server_script else DEFAULT_SERVER_SCRIPT
+        self.timeout = timeout
+        self.encoding = encoding
+        self.framing = framing
+        # Transport is fixed per process and told to the server via argv;
+        # switching mid-stream would race the blocked reader thread. If the
+        # server build ignores the flags and the handshake times out, we
+        # respawn once in plain newline JSON
+        self._use_msgpack = encoding == "msgpack" and ormsgpack is not None
+        self._length_prefixed = self._use_msgpack or framing == "length-prefix"
+        self.max_batch = max_batch
+        self.max_delay_ms = max_delay_ms
+        # Client-side LRU over tool results: a repeat call is a dict hit
+        # instead of a full RPC round trip
+        self._cache_size = cache_size
+        self._result_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.process: Optional[subprocess.Popen] = None
+        self._stderr_tail: deque = deque(maxlen=50)
+        # Response slots keyed by integer request id: [response, Event].
+        # A plain counter avoids uuid4's RNG read per call, and Event+list
+        # is lighter than a Queue's internal Condition/deque
+        self._next_id = itertools.count(1)
+        self._pending: Dict[int, list] = {}
+        # Guards only the stdin write: JSON-RPC multiplexes by id, so any
+        # number of requests may be in flight while callers wait unlocked
+        self._write_lock = threading.Lock()
+        self._reader_thread: Optional[threading.Thread] = None
+        # Micro-batching: single extract_facts/extract_entities calls that
+        # land within max_delay_ms collapse into one batch-* RPC
+        self._coalesce_q: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self._coalesce_thread = threading.Thread(
+            target=self._coalesce_worker, daemon=True
+        )
+        self._coalesce_thread.start()
+        # Warm standby processes so _restart_server swaps instead of
+        # paying a cold node spawn while the caller blocks
+        self._warm: deque = deque(maxlen=1)
+        self._replenish_event = threading.Event()
+        self._replenish_thread = threading.Thread(
+            target=self._replenisher, daemon=True
+        )
+        self._replenish_thread.start()
+        self._start_server()
+
+    # -- Process lifecycle ------------------------------------------------
+
+    def _spawn_process(self):
+        """Spawn one server process with raw binary pipes.
+
+        No per-line UTF-8 decode or newline translation: reads go through
+        one large BufferedReader and parsed bytes feed _loads directly.
+        """
+        cmd = ["node", str(self.server_script)]
+        if self._length_prefixed:
+            cmd.append("--framing=length-prefix")
+        if self._use_msgpack:
+            cmd.append("--encoding=msgpack")
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+        )
+        reader = io.BufferedReader(process.stdout, buffer_size=1 << 20)
+        return process, reader
+
+    def _spawn_warm(self):
+        """Spawn and handshake a standby server outside the live connection."""
+        process, reader = self._spawn_process()
+        # The initialize exchange is always JSON; a msgpack-negotiated
+        # server switches framing only after responding to it
+        self._write_all(process.stdin.fileno(), self._encode_request({
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": self._initialize_params(),
+        }))
+        while True:
+            response = self._read_frame(reader)
+            if response is None:
+                raise RuntimeError("warm MCP server exited during startup")
+            if response is False or not isinstance(response, dict):
+                continue
+            if response.get("id") == 0:
+                return process, reader
+
+    def _replenisher(self):
+        """Keep the warm-standby deque topped up in the background."""
+        while not self._closed:
+            self._replenish_event.wait()
+            self._replenish_event.clear()
+            if self._closed:
+                break
+            while len(self._warm) < (self._warm.maxlen or 1) and not self._closed:
+                try:
+                    self._warm.append(self._spawn_warm())
+                except Exception:
+                    time.sleep(1.0)  # back off instead of spinning on failure
+                    break
+
+    def _start_server(self):
+        """Wire up a server process, preferring a warm pre-initialized one."""
+        warm = self._warm.popleft() if self._warm else None
+        if warm is not None:
+            # Already spawned and handshaken: swap-in is effectively free
+            self.process, self._stdout_reader = warm
+            self._start_reader()
+        else:
+            self._connect_fresh()
+        self._replenish_event.set()
+
+    def _start_reader(self):
+        """Start reader and stderr-drain threads for the current process."""
+        self._reader_thread = threading.Thread(
+            target=self._read_responses, daemon=True
+        )
+        self._reader_thread.start()
+        # Drain server stderr off the response path so a chatty server
+        # can neither block on a full pipe nor cost the reader thread
+        # anything; the tail is kept for startup diagnostics
+        self._stderr_tail = deque(maxlen=50)
+        threading.Thread(
+            target=self._drain_stderr,
+            args=(self.process.stderr, self._stderr_tail),
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _drain_stderr(pipe, tail: deque):
+        """Low-priority thread: consume server stderr, keep the tail."""
+        try:
+            for line in pipe:
+                tail.append(line.decode("utf-8", errors="replace"))
+        except (OSError, ValueError):
+            pass
+
+    def _connect_fresh(self):
+        """Spawn and handshake a new server, downgrading transport once.
+
+        A server build that ignores the framing/encoding flags will never
+        answer a length-prefixed initialize; in that case respawn in plain
+        newline JSON so the client still works against stock servers.
+        """
+        self.process, self._stdout_reader = self._spawn_process()
+        self._start_reader()
+        try:
+            self._initialize()
+        except TimeoutError:
+            if not (self._use_msgpack or self._length_prefixed):
+                raise
+            self._use_msgpack = False
+            self._length_prefixed = False
+            self.process.kill()
+            self.process.wait()
+            self.process, self._stdout_reader = self._spawn_process()
+            self._start_reader()
+            self._initialize()
+
+    def _initialize(self):
+        """Block until the server answers the initialize handshake.
+
+        A ready signal instead of a worst-case timer: short handshake
+        attempts retry with exponential backoff until the server's tool
+        registry is loaded, so startup costs only the actual load time
+        rather than a fixed 500 ms sleep.
+        """
+        deadline = time.monotonic() + self.timeout
+        attempt_timeout = 0.05
+        while True:
+            if self.process.poll() is not None:
+                stderr = "".join(self._stderr_tail)
+                raise RuntimeError(
+                    "MCP server exited during startup: "
+                    + stderr.strip()[:200]
+                )
+            try:
+                self._send_request(
+                    "initialize", self._initialize_params(), timeout=attempt_timeout
+                )
+                return
+            except (TimeoutError, BrokenPipeError, OSError):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("MCP server failed to initialize")
+                attempt_timeout = min(attempt_timeout * 2, 1.0)
+
+    def _initialize_params(self) -> Dict[str, Any]:
+        """Initialize params, declaring the transport selected via argv."""
+        # Ask the server to return plain objects under result.data instead
+        # of JSON-in-a-string TextContent; responses are sniffed per-shape
+        # so older servers keep working unchanged
+        experimental: Dict[str, Any] = {"structured_results": True}
+        if self._length_prefixed:
+            experimental["framing"] = "length-prefix"
+        if self._use_msgpack:
+            experimental["encoding"] = "msgpack"
+        return {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {"experimental": experimental} if experimental else {},
+            "clientInfo": {"name": "mcp_client", "version": "2.0"},
+        }
+
+    def _health_check(self):
+        """Verify the server is responsive with a cheap tool call."""
+        self.call_tool("cache-stats", {})
+
+    def _restart_server(self):
+        """Kill the current server process and spawn a fresh one."""
+        if self.process is not None:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+        self._start_server()
+
+    def close(self):
+        """Stop the worker threads and terminate all server processes."""
+        if not self._closed:
+            self._closed = True
+            self._coalesce_q.put(None)  # wake the worker so it exits
+            self._replenish_event.set()  # wake the replenisher so it exits
+        while self._warm:
+            warm_process, _ = self._warm.popleft()
+            warm_process.kill()
+            warm_process.wait()
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # -- Transport --------------------------------------------------------
+
+    @staticmethod
+    def _write_all(fd: int, payload: bytes):
+        """Write one framed payload straight to the pipe fd.
+
+        stdin is opened with bufsize=0, so going through the file object
+        would still hit the kernel per write — but via an extra Python
+        call plus a no-op flush. A raw os.write is one syscall for the
+        whole frame; the loop only runs again on a partial write.
+        """
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+
+    def _encode_request(
+        self, request: Dict[str, Any], blob: Optional[bytes] = None
+    ) -> bytes:
+        """Frame one request in the active wire encoding.
+
+        A blob rides as an extra [u32 length][bytes] segment after the
+        JSON/msgpack body; the body references it with a {"__blob": 0}
+        marker, so large text is never escaped into a JSON string.
+        """
+        if self._use_msgpack:
+            body = ormsgpack.packb(request)
+        elif self._length_prefixed:
+            body = _dumps_line(request)
+        else:
+            return _dumps_line(request)
+        # Pack everything into one buffer so the send is a single
+        # os.write: no prefix+body concat chain, no small-write
+        # fragmentation on the pipe
+        body_len = len(body)
+        total = 4 + body_len
+        if blob is not None:
+            total += 4 + len(blob)
+        framed = bytearray(total)
+        struct.pack_into(">I", framed, 0, body_len)
+        framed[4:4 + body_len] = body
+        if blob is not None:
+            struct.pack_into(">I", framed, 4 + body_len, len(blob))
+            framed[8 + body_len:] = blob
+        return bytes(framed)
+
+    def _read_frame(self, reader) -> Optional[Any]:
+        """Read one response from the wire in the active encoding.
+
+        Returns the decoded message, False for a skippable non-protocol
+        line, or None at EOF.
+        """
+        if self._use_msgpack or self._length_prefixed:
+            # O(1) frame boundary: read the 4-byte length then the exact
+            # body, no byte-by-byte newline scan and no delimiter
+            # restrictions on payload content
+            header = reader.read(4)
+            if len(header) < 4:
+                return None
+            (length,) = struct.unpack(">I", header)
+            body = reader.read(length)
+            if len(body) < length:
+                return None
+            if self._use_msgpack:
+                return ormsgpack.unpackb(body)
+            return _loads(body)
+        line = reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            return False
+        try:
+            return _loads(line)
+        except ValueError:
+            return False  # server log output, not protocol
+
+    def _read_responses(self):
+        """Reader thread: route each response to its waiting caller."""
+        # Bind the reader once: after a restart the old thread keeps
+        # draining its own (EOF'd) pipe instead of racing the new one.
+        # Hot-loop names are hoisted to locals — this loop runs once per
+        # response, and LOAD_FAST beats repeated attribute lookups
+        reader = self._stdout_reader
+        read_frame = self._read_frame
+        pending_pop = self._pending.pop
+        try:
+            while True:
+                response = read_frame(reader)
+                if response is None:
+                    break
+                if response is False or not isinstance(response, dict):
+                    continue
+                request_id = response.get("id")
+                if request_id is None:
+                    continue  # notification; nobody is waiting
+                slot = pending_pop(request_id, None)
+                if slot is not None:
+                    if "result" in response:
+                        response["result"] = _unwrap_result(
+                            response["result"], slot[2]
+                        )
+                    slot[0] = response
+                    slot[1].set()
+        except Exception:
+            # No print on the response path: stdout writes hold the GIL
+            # and can stall the reader when a dying server floods it
+            logger.warning("MCP reader thread exiting", exc_info=True)
+
+    def _enqueue(
+        self,
+        method: str,
+        params: Dict[str, Any],
+        projection: Optional[List[str]] = None,
+        blob: Optional[bytes] = None,
+    ) -> tuple:
+        """Fire one request without waiting; returns a token for _await."""
+        request_id = next(self._next_id)
+        done = threading.Event()
+        slot = [None, done, projection]
+        self._pending[request_id] = slot
+
+        payload = self._encode_request({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params,
+        }, blob=blob)
+        # Only the write itself needs mutual exclusion; waiting happens
+        # unlocked so concurrent callers pipeline their requests
+        with self._write_lock:
+            self._write_all(self.process.stdin.fileno(), payload)
+        return request_id, method, slot
+
+    def _await(self, token: tuple, timeout: float) -> Any:
+        """Block on an _enqueue token and return its result."""
+        request_id, method, slot = token
+        if not slot[1].wait(timeout=timeout):
+            self._pending.pop(request_id, None)
+            raise TimeoutError(f"MCP request timed out: {method}")
+        response = slot[0]
+
+        if "error" in response:
+            raise RuntimeError(f"MCP error: {response['error']}")
+        return response.get("result")
+
+    def _send_request(
+        self,
+        method: str,
+        params: Dict[str, Any],
+        timeout: Optional[float] = None,
+        projection: Optional[List[str]] = None,
+        blob: Optional[bytes] = None,
+    ) -> Any:
+        """Send one JSON-RPC request and wait for its response."""
+        if timeout is None:
+            timeout = self.timeout
+            # Handshake attempts pass an explicit timeout and watch the
+            # process themselves; only regular calls auto-restart here
+            if self.process is None or self.process.poll() is not None:
+                self._restart_server()
+        return self._await(
+            self._enqueue(method, params, projection, blob), timeout
+        )
+
+    # -- Tool methods -----------------------------------------------------
+
+    def _is_cacheable(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
+        """Whether a tool result may be served from the client-side cache."""
+        return (
+            self._cache_size > 0
+            and tool_name not in self._UNCACHEABLE_TOOLS
+            and not arguments.get("verify_urls")
+        )
+
+    def clear_cache(self):
+        """Drop all client-side cached tool results."""
+        with self._cache_lock:
+            self._result_cache.clear()
+
+    def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        response_projection: Optional[List[str]] = None,
+    ) -> Any:
+        """Call one MCP tool by name, serving repeats from the LRU cache.
+
+        With response_projection (a list of JSON pointers like
+        "/metadata/total_facts"), only those nodes of the response body
+        are materialized and the call returns a pointer-to-value dict —
+        useful for summary fields of large batch responses.
+        """
+        cacheable = self._is_cacheable(tool_name, arguments)
+        if cacheable:
+            key = hashlib.blake2b(
+                tool_name.encode("utf-8")
+                + _canonical_dumps(arguments)
+                + _canonical_dumps(response_projection or []),
+                digest_size=16,
+            ).digest()
+            with self._cache_lock:
+                cached = self._result_cache.get(key)
+                if cached is not None:
+                    self._result_cache.move_to_end(key)
+            if cached is not None:
+                # Deep copy so callers can mutate results safely
+                return copy.deepcopy(cached)
+
+        # Large text ships as a raw binary segment: no JSON string
+        # escaping on this side, no unescape on the server's
+        send_args = arguments
+        blob = None
+        text = arguments.get("text")
+        if (
+            self._length_prefixed
+            and isinstance(text, str)
+            and len(text) > _BLOB_THRESHOLD
+        ):
+            blob = text.encode("utf-8")
+            send_args = {**arguments, "text": {"__blob": 0}}
+
+        result = self._send_request(
+            "tools/call",
+            {"name": tool_name, "arguments": send_args},
+            projection=response_projection,
+            blob=blob,
+        )
+
+        if cacheable and result is not None:
+            with self._cache_lock:
+                self._result_cache[key] = copy.deepcopy(result)
+                self._result_cache.move_to_end(key)
+                while len(self._result_cache) > self._cache_size:
+                    self._result_cache.popitem(last=False)
+        return result
+
+    def batch_call(self, calls: List[tuple]) -> List[Any]:
+        """Run many (tool_name, arguments) calls pipelined over one pipe.
+
+        All requests are written before the first response is awaited, so
+        the server overlaps them up to its own maxConcurrency; results
+        come back in input order. Bypasses the client-side result cache —
+        use call_tool for cacheable repeats.
+
+        Args:
+            calls: (tool_name, arguments) tuples, one per call
+
+        Returns:
+            Tool results in the same order as calls
+        """
+        if self.process is None or self.process.poll() is not None:
+            self._restart_server()
+        tokens = [
+            self._enqueue("tools/call", {"name": tool_name, "arguments": arguments})
+            for tool_name, arguments in calls
+        ]
+        return [self._await(token, self.timeout) for token in tokens]
+
+    def parallel_map(
+        self,
+        tool_name: str,
+        args_list: List[Dict[str, Any]],
+        max_workers: int = 8,
+    ) -> List[Any]:
+        """Call one tool for each argument dict, overlapping the RPCs.
+
+        Requests pipeline over the single stdio connection up to the
+        server's own concurrency limit; results come back in input order.
+
+        Args:
+            tool_name: Tool to call for every item
+            args_list: One arguments dict per call
+            max_workers: Caller-side thread fan-out
+
+        Returns:
+            Tool results in the same order as args_list
+        """
+        with ThreadPoolExecutor(max_workers=min(max_workers, max(len(args_list), 1))) as pool:
+            return list(
+                pool.map(lambda args: self.call_tool(tool_name, args), args_list)
+            )
+
+    # -- Request coalescing -----------------------------------------------
+
+    def _coalesce_worker(self):
+        """Collect single calls into windows and dispatch them as batches."""
+        max_delay = self.max_delay_ms / 1000.0
+        while not self._closed:
+            try:
+                first = self._coalesce_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if first is None:
+                break
+            batch = [first]
+            # Fill the window: up to max_batch items or max_delay_ms, or
+            # until a flush barrier forces immediate dispatch
+            deadline = time.monotonic() + max_delay
+            while len(batch) < self.max_batch and batch[-1][0] != "flush":
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._coalesce_q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._closed = True
+                    break
+                batch.append(item)
+            self._dispatch_batch(batch)
+
+    def _dispatch_batch(self, batch: List[tuple]):
+        """Send one window of coalesced calls, one RPC per (kind, options)."""
+        groups: Dict[tuple, List[tuple]] = {}
+        for item in batch:
+            kind = item[0]
+            if kind == "flush":
+                item[1].set_result(None)
+                continue
+            _, text, options, fut = item
+            key = (kind, tuple(sorted(options.items())))
+            groups.setdefault(key, []).append((text, fut))
+
+        for (kind, options_key), group in groups.items():
+            options = dict(options_key)
+            try:
+                if len(group) == 1:
+                    # Lone call in the window: no batching overhead
+                    text, fut = group[0]
+                    tool = "fact-extract" if kind == "fact" else "entity-extract"
+                    fut.set_result(self.call_tool(tool, {"text": text, **options}))
+                    continue
+                response = self.call_tool(
+                    self._BATCH_TOOLS[kind],
+                    {
+                        "items": [{"text": text} for text, _ in group],
+                        "options": options,
+                    },
+                )
+                results = (
+                    response.get("results", [])
+                    if isinstance(response, dict)
+                    else response
+                )
+                for (text, fut), result in zip(group, results):
+                    # Unwrap the per-item batch envelope ({id, success, data,
+                    # error, ...}) so coalesced calls resolve with the same
+                    # payload shape as a solo call_tool
+                    if isinstance(result, dict) and "success" in result:
+                        if result.get("success"):
+                            fut.set_result(result.get("data"))
+                        else:
+                            fut.set_exception(
+                                RuntimeError(
+                                    f"Batch item failed: {result.get('error')}"
+                                )
+                            )
+                    else:
+                        fut.set_result(result)
+                for text, fut in group[len(results):]:
+                    fut.set_exception(
+                        RuntimeError("Batch response shorter than request")
+                    )
+            except Exception as e:
+                for _, fut in group:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+    def _coalesced_call(self, kind: str, text: str, options: Dict[str, Any]) -> Any:
+        """Queue one call for coalescing and block on its result."""
+        fut: Future = Future()
+        self._coalesce_q.put((kind, text, options, fut))
+        return fut.result(timeout=self.timeout)
+
+    def flush(self):
+        """Force the current coalescing window to dispatch immediately."""
+        fut: Future = Future()
+        self._coalesce_q.put(("flush", fut))
+        fut.result(timeout=self.timeout)
+
+    def extract_facts(self, text: str, **options) -> Any:
+        """Extract atomic facts from text (coalesced into batch RPCs)."""
+        return self._coalesced_call("fact", text, options)
+
+    def extract_entities(self, text: str, **options) -> Any:
+        """Extract named entities and relationships (coalesced)."""
+        return self._coalesced_call("entity", text, options)
+
+    def validate_citations(self, citations: List[Dict[str, Any]], **options) -> Any:
+        """Validate citation completeness and quality."""
+        return self.call_tool("citation-validate", {"citations": citations, **options})
+
+    def batch_extract_facts(self, items: List[Dict[str, Any]], **options) -> Any:
+        """Extract facts from many texts in one server-side batch."""
+        return self.call_tool("batch-fact-extract", {"items": items, **options})
+
+    def batch_extract_entities(self, items: List[Dict[str, Any]], **options) -> Any:
+        """Extract entities from many texts in one server-side batch."""
+        return self.call_tool("batch-entity-extract", {"items": items, **options})
+
+    def cache_stats(self) -> Any:
+        """Fetch server-side cache statistics."""
+        return self.call_tool("cache-stats", {})
+
+
+class AsyncMCPClient:
+    """Asyncio MCP client.
+
+    Speaks the same JSON-RPC-over-stdio protocol as MCPClientV2, but the
+    event loop drains stdout directly and per-request Futures replace the
+    reader thread + Event handoff. Coroutines overlap naturally, so
+    hundreds of RPCs can be in flight on one loop with no per-response
+    thread context switch.
+    """
+
+    def __init__(
+        self,
+        server_script: Optional[str] = None,
+        timeout: float = 30.0,
+        max_concurrency: int = 8,
+    ):
+        self.server_script = Path(server_script) if server_script else DEFAULT_SERVER_SCRIPT
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._next_id = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> "AsyncMCPClient":
+        """Spawn the server process and start the stdout reader task."""
+        self._proc = await asyncio.create_subprocess_exec(
+            "node", str(self.server_script),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._reader_task = asyncio.ensure_future(self._reader())
+        return self
+
+    async def close(self):
+        """Stop the reader task and terminate the server process."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._proc is not None:
+            if self._proc.returncode is None:
+                self._proc.terminate()
+            await self._proc.wait()
+            self._proc = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _reader(self):
+        """Route each response line to the Future waiting on its id."""
+        async for line in self._proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                response = _loads(line)
+            except ValueError:
+                continue  # server log output, not protocol
+            if not isinstance(response, dict):
+                continue  # valid JSON but not a response object
+            request_id = response.get("id")
+            fut = self._pending.pop(request_id, None)
+            if fut is not None and not fut.done():
+                if "result" in response:
+                    response["result"] = _unwrap_result(response["result"])
+                fut.set_result(response)
+
+    async def _send_request(self, method: str, params: Dict[str, Any]) -> Any:
+        """Send one JSON-RPC request and await its response."""
+        request_id = next(self._next_id)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = fut
+
+        self._proc.stdin.write(_dumps_line({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params,
+        }))
+        await self._proc.stdin.drain()
+
+        try:
+            response = await asyncio.wait_for(fut, self.timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(request_id, None)
+            raise TimeoutError(f"MCP request timed out: {method}")
+
+        if "error" in response:
+            raise RuntimeError(f"MCP error: {response['error']}")
+        return response.get("result")
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call one MCP tool by name."""
+        return await self._send_request(
+            "tools/call", {"name": tool_name, "arguments": arguments}
+        )
+
+    async def batch(self, calls: List[tuple]) -> List[Any]:
+        """Run many (tool_name, arguments) calls concurrently.
+
+        In-flight requests are capped at max_concurrency by a Semaphore;
+        results come back in input order.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(tool_name, arguments):
+            async with semaphore:
+                return await self.call_tool(tool_name, arguments)
+
+        return await asyncio.gather(
+            *(bounded(tool_name, arguments) for tool_name, arguments in calls)
+        )
+
+
+def _benchmark(client: MCPClientV2) -> Dict[str, Any]:
+    """Compare serial calls against a pipelined batch_call workload."""
+    texts = [
+        f"Company {i} reported revenue of ${i + 1} billion in 2024, "
+        f"growing {10 + i}% year over year according to its annual report."
+        for i in range(10)
+    ]
+    calls = [("fact-extract", {"text": text}) for text in texts]
+
+    start = time.perf_counter()
+    for tool_name, arguments in calls:
+        client.call_tool(tool_name, arguments)
+    serial = time.perf_counter() - start
+
+    client.clear_cache()  # don't let the serial pass feed the batch pass
+    start = time.perf_counter()
+    client.batch_call(calls)
+    batched = time.perf_counter() - start
+
+    return {
+        "calls": len(texts),
+        "serial_seconds": round(serial, 3),
+        "batch_seconds": round(batched, 3),
+        "speedup": round(serial / batched, 1) if batched else None,
+    }
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="MCP Client - Python client for the research MCP server"
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    call_parser = subparsers.add_parser("call", help="Call one MCP tool")
+    call_parser.add_argument("tool", help="Tool name (e.g. fact-extract)")
+    call_parser.add_argument("args", nargs="?", default="{}", help="JSON arguments")
+    call_parser.add_argument(
+        "--v1", action="store_true", help="Use the one-shot legacy transport"
+    )
+
+    subparsers.add_parser("benchmark", help="Benchmark the persistent transport")
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    try:
+        if args.command == "call":
+            arguments = json.loads(args.args)
+            if args.v1:
+                result = MCPClient()._call_tool(args.tool, arguments)
+            else:
+                with MCPClientV2() as client:
+                    result = client.call_tool(args.tool, arguments)
+            print(json.dumps(result, indent=2))
+
+        elif args.command == "benchmark":
+            with MCPClientV2() as client:
+                result = _benchmark(client)
+            print(json.dumps(result, indent=2))
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
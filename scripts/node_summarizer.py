@@ -17,14 +17,37 @@ Usage:
     summary = summarizer.compress_node(content="Long content...", target_ratio=0.1)
 """
 
+import functools
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
+try:
+    import tiktoken  # Optional: real BPE token counts for tight max_tokens budgets
+except ImportError:
+    tiktoken = None
 
-@dataclass
+
+@functools.lru_cache(maxsize=None)
+def _get_encoder(model: str):
+    """Load the BPE encoder for a model once (cl100k_base fallback)."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@dataclass(slots=True, frozen=True)
 class CompressionResult:
-    """Result of node compression"""
+    """Result of node compression.
+
+    Slotted and frozen: session runs allocate thousands of these, and
+    slots roughly halve the per-instance footprint while immutability
+    keeps cached results safe to share across callers.
+    """
     summary: str
     original_tokens: int
     summary_tokens: int
@@ -32,6 +55,143 @@ class CompressionResult:
     compression_time_ms: float
 
 
+@dataclass(slots=True)
+class BatchItem:
+    """One node's outcome in a batch compression"""
+    node_id: str
+    result: Optional[CompressionResult] = None
+    error: Optional[str] = None
+
+
+# Static compression instructions. Kept in a cacheable system prompt, ahead
+# of all variable content, so the provider serves the shared prefix from its
+# KV cache on every call after the first instead of re-prefilling it.
+COMPRESSION_SYSTEM_PROMPT = """You compress research content into dense summaries.
+
+Compression Guidelines:
+- Extract core findings and facts
+- Maintain numerical data and statistics
+- Preserve entity names and relationships
+- Remove verbose explanations and redundancy"""
+
+CITATION_INSTRUCTION = "\n- Keep all citation references [Author, Year]"
+
+PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+@functools.lru_cache(maxsize=None)
+def _get_clients() -> tuple:
+    """Build the shared sync/async Anthropic clients once per process.
+
+    Every NodeSummarizer() — and both StateManager helper functions —
+    previously constructed a fresh client, each with its own httpx pool
+    and a TLS handshake on first request. A single pooled transport keeps
+    connections alive across all callers in the process.
+
+    Returns:
+        (sync_client, async_client, retryable_exception_types)
+    """
+    import anthropic
+    import httpx  # anthropic dependency, always present alongside it
+
+    api_key = os.environ.get("GLM_API_KEY")
+    if not api_key:
+        raise RuntimeError(
+            "GLM_API_KEY environment variable not set. "
+            "Export it before using the node summarizer."
+        )
+
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    kwargs = {
+        "api_key": api_key,
+        "base_url": os.getenv("GLM_BASE_URL", "https://open.bigmodel.cn/api/anthropic"),
+    }
+    sync_client = anthropic.Anthropic(
+        http_client=httpx.Client(limits=limits), **kwargs
+    )
+    async_client = anthropic.AsyncAnthropic(
+        http_client=httpx.AsyncClient(limits=limits), **kwargs
+    )
+    # Worth retrying: rate limits, connection drops, provider 5xx.
+    # Anything else (auth, bad request) fails fast
+    retryable = (
+        anthropic.RateLimitError,
+        anthropic.APIConnectionError,
+        anthropic.InternalServerError,
+    )
+    return sync_client, async_client, retryable
+
+
+def _content_hash(text: str) -> str:
+    """Short stable hash of node content, stored with its summary."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Execution backend per model. Remote providers multiplex fine from one
+# process (asyncio fan-out); local inference holds the GIL through
+# tokenization and doesn't multiplex, so it fans out across processes —
+# which also isolates any segfaulting native inference library.
+BACKENDS = {
+    "glm-4.7": "remote",
+    "haiku": "remote",
+    "llama-local": "process",
+}
+
+
+def _process_worker(
+    model: str,
+    default_ratio: float,
+    node: Dict[str, Any],
+    target_ratio: Optional[float]
+) -> "BatchItem":
+    """Compress one node inside a worker process (local-model backends).
+
+    Module-level so it pickles; NodeSummarizer.get() keeps the client and
+    tokenizer loaded once per worker across submissions.
+    """
+    summarizer = NodeSummarizer.get(model, default_ratio)
+    try:
+        result = summarizer.compress_node(
+            node['content'], target_ratio,
+            ancestor_context=node.get('ancestor')
+        )
+        return BatchItem(node['node_id'], result=result)
+    except Exception as e:
+        return BatchItem(node['node_id'], error=str(e))
+
+
+# Nodes shorter than this aren't worth an API round-trip to shrink
+MIN_COMPRESS_TOKENS = 200
+
+# Terminate generation if the model starts echoing the source block back
+STOP_SEQUENCES = ["\n\nOriginal Content:"]
+
+# Transient API failures retry this many times with capped exponential
+# backoff + jitter before giving up
+MAX_RETRIES = 5
+MAX_BACKOFF_SECONDS = 30.0
+
+# Batch packing: nodes under SMALL_NODE_TOKENS share one request, grouped
+# until the packed input reaches PACK_BUDGET_TOKENS or PACK_MAX_NODES. The
+# ~150-token static prompt is then paid once per group instead of per node.
+SMALL_NODE_TOKENS = 2000
+PACK_BUDGET_TOKENS = 8000
+PACK_MAX_NODES = 10
+
+# Memoized compression results keyed by content hash. GoT nodes often
+# duplicate boilerplate/citation blocks, and --force reruns resend
+# identical content; a hit here skips the ~100ms API round-trip entirely.
+_RESULT_CACHE_MAX = 4096
+_result_cache: OrderedDict = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+# BPE token counts keyed by content hash: the same node body is counted
+# in compress paths, packing, and statistics, and re-encoding a 10kB
+# string each time is O(n) where a hash + dict lookup is not.
+_TOKEN_COUNT_CACHE_MAX = 16384
+_token_count_cache: OrderedDict = OrderedDict()
+_token_count_cache_lock = threading.Lock()
+
+
 class NodeSummarizer:
     """
     Compresses GoT node content using fast LLM summarization.
@@ -54,24 +214,39 @@ class NodeSummarizer:
         self.model = model
         self.default_ratio = default_ratio
 
-        # Initialize Anthropic client
+        # Shared per-process clients: pooled connections, one TLS
+        # handshake instead of one per NodeSummarizer instantiation
         try:
-            import anthropic
-            self.client = anthropic.Anthropic(
-                api_key="a887d72b96e84cc6895e42bd9e9b6cab.7wTFZFgYBLAdQ9Gq",
-                base_url="https://open.bigmodel.cn/api/anthropic"
-            )
+            self.client, self.aclient, self._retryable = _get_clients()
         except ImportError:
             raise ImportError(
                 "anthropic package not installed. "
                 "Run: pip install anthropic"
             )
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get(
+        cls,
+        model: str = "glm-4.7",
+        default_ratio: float = 0.1
+    ) -> "NodeSummarizer":
+        """Shared summarizer instance per (model, ratio).
+
+        Helper functions used to build a fresh NodeSummarizer per call;
+        the cached instance makes second and later invocations in the
+        same process free and keeps them on the pooled HTTP client.
+        """
+        return cls(model, default_ratio)
+
     def estimate_tokens(self, text: str) -> int:
         """
         Estimate token count for text.
 
-        Uses rough approximation: 1 token ≈ 4 characters
+        Uses a real BPE encoding when tiktoken is installed — the
+        1-token-per-4-chars heuristic is badly off for code, citations
+        and CJK, which skews max_tokens budgets. Falls back to the
+        approximation when tiktoken is unavailable.
 
         Args:
             text: Input text
@@ -79,13 +254,32 @@ class NodeSummarizer:
         Returns:
             Estimated token count
         """
-        return len(text) // 4
+        if tiktoken is None:
+            return len(text) // 4
+        # Repeat counts of the same body are a hash + dict hit, not a
+        # full BPE encode
+        key = (
+            self.model,
+            hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        )
+        with _token_count_cache_lock:
+            count = _token_count_cache.get(key)
+            if count is not None:
+                _token_count_cache.move_to_end(key)
+        if count is None:
+            count = len(_get_encoder(self.model).encode(text))
+            with _token_count_cache_lock:
+                _token_count_cache[key] = count
+                while len(_token_count_cache) > _TOKEN_COUNT_CACHE_MAX:
+                    _token_count_cache.popitem(last=False)
+        return count
 
     def compress_node(
         self,
         content: str,
         target_ratio: Optional[float] = None,
-        preserve_citations: bool = True
+        preserve_citations: bool = True,
+        ancestor_context: Optional[str] = None
     ) -> CompressionResult:
         """
         Compress GoT node content to summary.
@@ -94,6 +288,7 @@ class NodeSummarizer:
             content: Full node content
             target_ratio: Compression ratio (default: 0.1 = 10:1)
             preserve_citations: Keep citation references
+            ancestor_context: Shared ancestor summary for sibling nodes
 
         Returns:
             CompressionResult with summary and metrics
@@ -105,10 +300,30 @@ class NodeSummarizer:
         if target_ratio is None:
             target_ratio = self.default_ratio
 
+        # Serve duplicate content from the in-process result cache
+        cache_key = (
+            self.model,
+            target_ratio,
+            preserve_citations,
+            ancestor_context,
+            hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        )
+        with _result_cache_lock:
+            cached = _result_cache.get(cache_key)
+            if cached is not None:
+                _result_cache.move_to_end(cache_key)
+        if cached is not None:
+            return cached
+
         # Calculate target length
         original_tokens = self.estimate_tokens(content)
         target_tokens = int(original_tokens * target_ratio)
 
+        # Already short enough: return as-is, no API latency
+        shortcut = self._short_circuit(content, original_tokens, target_tokens)
+        if shortcut is not None:
+            return shortcut
+
         # Build compression prompt
         prompt = self._build_compression_prompt(
             content=content,
@@ -116,18 +331,11 @@ class NodeSummarizer:
             preserve_citations=preserve_citations
         )
 
-        # Call LLM for compression
+        # Call LLM for compression (streamed, retried on transient errors)
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=target_tokens + 100,  # Small buffer
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            summary = self._call_llm(
+                prompt, target_tokens, preserve_citations, ancestor_context
             )
-
-            summary = message.content[0].text
-
         except Exception as e:
             raise RuntimeError(f"Compression failed: {e}")
 
@@ -136,7 +344,7 @@ class NodeSummarizer:
         actual_ratio = summary_tokens / original_tokens if original_tokens > 0 else 0
         compression_time = (time.time() - start_time) * 1000  # ms
 
-        return CompressionResult(
+        result = CompressionResult(
             summary=summary,
             original_tokens=original_tokens,
             summary_tokens=summary_tokens,
@@ -144,77 +352,472 @@ class NodeSummarizer:
             compression_time_ms=compression_time
         )
 
+        with _result_cache_lock:
+            _result_cache[cache_key] = result
+            while len(_result_cache) > _RESULT_CACHE_MAX:
+                _result_cache.popitem(last=False)
+
+        return result
+
+    @staticmethod
+    def _max_tokens_for(target_tokens: int) -> int:
+        """Output budget for a given target length.
+
+        Decode time scales with tokens actually generated, so the budget
+        sits nearly at the target when real BPE counts are available;
+        the chars/4 estimator keeps the old headroom to avoid truncating
+        summaries it under-counted.
+        """
+        return target_tokens + (16 if tiktoken is not None else 100)
+
+    @staticmethod
+    def _retry_delay(attempt: int, exc: Exception) -> float:
+        """Backoff before the next retry, honoring Retry-After if sent."""
+        import random
+
+        response = getattr(exc, 'response', None)
+        if response is not None:
+            retry_after = response.headers.get('retry-after')
+            if retry_after:
+                try:
+                    return min(float(retry_after), MAX_BACKOFF_SECONDS)
+                except ValueError:
+                    pass
+        return min(2 ** attempt + random.uniform(0, 1), MAX_BACKOFF_SECONDS)
+
+    def _call_llm(
+        self,
+        prompt: str,
+        target_tokens: int,
+        preserve_citations: bool,
+        ancestor_context: Optional[str] = None
+    ) -> str:
+        """Streamed completion with retry on transient provider errors.
+
+        Accumulates text deltas and aborts the request once output passes
+        120% of the target (chars/4 bound — close enough for an overshoot
+        guard without re-encoding each delta).
+        """
+        import time
+
+        char_limit = int(target_tokens * 1.2) * 4
+        for attempt in range(MAX_RETRIES):
+            try:
+                chunks = []
+                running_chars = 0
+                with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=self._max_tokens_for(target_tokens),
+                    stop_sequences=STOP_SEQUENCES,
+                    system=self._system_blocks(preserve_citations, ancestor_context),
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    extra_headers=PROMPT_CACHING_HEADERS
+                ) as stream:
+                    for delta in stream.text_stream:
+                        chunks.append(delta)
+                        running_chars += len(delta)
+                        if running_chars >= char_limit:
+                            break  # leaving the context aborts generation
+                return "".join(chunks)
+            except self._retryable as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                time.sleep(self._retry_delay(attempt, e))
+
+    async def _acall_llm(
+        self,
+        prompt: str,
+        target_tokens: int,
+        preserve_citations: bool,
+        ancestor_context: Optional[str] = None
+    ) -> str:
+        """Async mirror of _call_llm."""
+        import asyncio
+
+        char_limit = int(target_tokens * 1.2) * 4
+        for attempt in range(MAX_RETRIES):
+            try:
+                chunks = []
+                running_chars = 0
+                async with self.aclient.messages.stream(
+                    model=self.model,
+                    max_tokens=self._max_tokens_for(target_tokens),
+                    stop_sequences=STOP_SEQUENCES,
+                    system=self._system_blocks(preserve_citations, ancestor_context),
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    extra_headers=PROMPT_CACHING_HEADERS
+                ) as stream:
+                    async for delta in stream.text_stream:
+                        chunks.append(delta)
+                        running_chars += len(delta)
+                        if running_chars >= char_limit:
+                            break  # leaving the context aborts generation
+                return "".join(chunks)
+            except self._retryable as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, e))
+
+    def _short_circuit(
+        self,
+        content: str,
+        original_tokens: int,
+        target_tokens: int
+    ) -> Optional[CompressionResult]:
+        """Return the content unchanged when compression can't help.
+
+        Short leaf nodes (common at depth >= 3) are often already at or
+        below the target length; summarizing them spends a round-trip to
+        save nothing, and tiny texts lose information instead of bulk.
+        """
+        if (original_tokens < MIN_COMPRESS_TOKENS
+                or original_tokens <= int(target_tokens * 1.1)):
+            return CompressionResult(
+                summary=content,
+                original_tokens=original_tokens,
+                summary_tokens=original_tokens,
+                actual_ratio=1.0,
+                compression_time_ms=0.0
+            )
+        return None
+
+    def _system_blocks(
+        self,
+        preserve_citations: bool,
+        ancestor_context: Optional[str] = None
+    ) -> list:
+        """Build the static system prompt, marked for provider caching.
+
+        Only two base variants exist (with/without the citation rule), so
+        that block is byte-identical across calls and prefix-cache
+        friendly. Sibling GoT nodes share their ancestor's summary as a
+        second cached block: it is identical for every sibling, so the
+        provider prefills it once per group instead of once per node.
+        """
+        text = COMPRESSION_SYSTEM_PROMPT
+        if preserve_citations:
+            text += CITATION_INSTRUCTION
+        blocks = [{
+            "type": "text",
+            "text": text,
+            "cache_control": {"type": "ephemeral"}
+        }]
+        if ancestor_context:
+            blocks.append({
+                "type": "text",
+                "text": (
+                    "Ancestor context shared by the nodes being compressed "
+                    "(for reference, do not restate):\n" + ancestor_context
+                ),
+                "cache_control": {"type": "ephemeral"}
+            })
+        return blocks
+
     def _build_compression_prompt(
         self,
         content: str,
         target_tokens: int,
         preserve_citations: bool
     ) -> str:
-        """Build compression prompt for LLM."""
-        citation_instruction = ""
-        if preserve_citations:
-            citation_instruction = "\n- Keep all citation references [Author, Year]"
+        """Build the user prompt: variable content goes last.
 
-        return f"""Compress the following research content to approximately {target_tokens} tokens while preserving key information:
+        All static guidance lives in the system prompt; keeping the node
+        content at the tail means everything before it is a shared prefix
+        the provider can cache across nodes.
+        """
+        return f"""Compress the following research content to approximately {target_tokens} tokens while preserving key information.
 
 Original Content:
 {content}
 
-Compression Guidelines:
-- Extract core findings and facts
-- Maintain numerical data and statistics
-- Preserve entity names and relationships{citation_instruction}
-- Remove verbose explanations and redundancy
-- Target length: ~{target_tokens} tokens
-
 Compressed Summary:"""
 
+    async def _acompress_node(
+        self,
+        content: str,
+        target_ratio: Optional[float] = None,
+        preserve_citations: bool = True,
+        ancestor_context: Optional[str] = None
+    ) -> CompressionResult:
+        """Async mirror of compress_node, sharing cache and prompts."""
+        import time
+
+        start_time = time.time()
+
+        if target_ratio is None:
+            target_ratio = self.default_ratio
+
+        cache_key = (
+            self.model,
+            target_ratio,
+            preserve_citations,
+            ancestor_context,
+            hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        )
+        with _result_cache_lock:
+            cached = _result_cache.get(cache_key)
+            if cached is not None:
+                _result_cache.move_to_end(cache_key)
+        if cached is not None:
+            return cached
+
+        original_tokens = self.estimate_tokens(content)
+        target_tokens = int(original_tokens * target_ratio)
+
+        shortcut = self._short_circuit(content, original_tokens, target_tokens)
+        if shortcut is not None:
+            return shortcut
+
+        prompt = self._build_compression_prompt(
+            content=content,
+            target_tokens=target_tokens,
+            preserve_citations=preserve_citations
+        )
+
+        try:
+            summary = await self._acall_llm(
+                prompt, target_tokens, preserve_citations, ancestor_context
+            )
+        except Exception as e:
+            raise RuntimeError(f"Compression failed: {e}")
+
+        summary_tokens = self.estimate_tokens(summary)
+        actual_ratio = summary_tokens / original_tokens if original_tokens > 0 else 0
+        compression_time = (time.time() - start_time) * 1000  # ms
+
+        result = CompressionResult(
+            summary=summary,
+            original_tokens=original_tokens,
+            summary_tokens=summary_tokens,
+            actual_ratio=actual_ratio,
+            compression_time_ms=compression_time
+        )
+
+        with _result_cache_lock:
+            _result_cache[cache_key] = result
+            while len(_result_cache) > _RESULT_CACHE_MAX:
+                _result_cache.popitem(last=False)
+
+        return result
+
+    async def _acompress_packed(
+        self,
+        group: list[Dict[str, Any]],
+        target_ratio: float
+    ) -> list[BatchItem]:
+        """Compress several small nodes in one LLM request.
+
+        The static prompt overhead is amortized across the group; the
+        model returns a JSON array with one summary per document. Falls
+        back to per-node compression if the packed response can't be
+        parsed.
+        """
+        import json
+        import time
+
+        start_time = time.time()
+
+        parts = [
+            f"--- DOC {i} ---\n{node['content']}"
+            for i, node in enumerate(group, 1)
+        ]
+        prompt = (
+            f"Compress each of the following {len(group)} documents to "
+            f"approximately {int(target_ratio * 100)}% of its original length, "
+            "following the compression guidelines for each one.\n"
+            'Respond ONLY with a JSON array: '
+            '[{"id": 1, "summary": "..."}, {"id": 2, "summary": "..."}, ...]\n\n'
+            + "\n\n".join(parts)
+        )
+
+        total_target = sum(
+            int(self.estimate_tokens(node['content']) * target_ratio)
+            for node in group
+        )
+
+        import asyncio
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                message = await self.aclient.messages.create(
+                    model=self.model,
+                    max_tokens=total_target + self._max_tokens_for(0) * len(group) + 50,
+                    system=self._system_blocks(True, group[0].get('ancestor')),
+                    messages=[{"role": "user", "content": prompt}],
+                    extra_headers=PROMPT_CACHING_HEADERS
+                )
+                break
+            except self._retryable as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, e))
+        text = message.content[0].text
+        try:
+            # Tolerate prose or fencing around the array
+            parsed = json.loads(text[text.index('['):text.rindex(']') + 1])
+            summaries = {int(item['id']): item['summary'] for item in parsed}
+            if len(summaries) < len(group):
+                raise ValueError("packed response missing documents")
+        except (ValueError, KeyError, TypeError):
+            # Unparseable pack: recompress each node individually
+            results = []
+            for node in group:
+                try:
+                    result = await self._acompress_node(
+                        node['content'], target_ratio,
+                        ancestor_context=node.get('ancestor')
+                    )
+                    results.append(BatchItem(node['node_id'], result=result))
+                except Exception as e:
+                    results.append(BatchItem(node['node_id'], error=str(e)))
+            return results
+
+        elapsed_ms = (time.time() - start_time) * 1000 / len(group)
+        results = []
+        for i, node in enumerate(group, 1):
+            summary = summaries[i]
+            original_tokens = self.estimate_tokens(node['content'])
+            summary_tokens = self.estimate_tokens(summary)
+            results.append(BatchItem(
+                node['node_id'],
+                result=CompressionResult(
+                    summary=summary,
+                    original_tokens=original_tokens,
+                    summary_tokens=summary_tokens,
+                    actual_ratio=(
+                        summary_tokens / original_tokens if original_tokens > 0 else 0
+                    ),
+                    compression_time_ms=elapsed_ms
+                )
+            ))
+        return results
+
+    def _pack_groups(self, nodes: list[Dict[str, Any]]) -> tuple:
+        """Split nodes into packable small-node groups and large singles."""
+        groups: list[list] = []
+        current: list = []
+        current_tokens = 0
+        large: list = []
+
+        for node in nodes:
+            tokens = self.estimate_tokens(node['content'])
+            # Tiny nodes short-circuit without an API call; large nodes
+            # keep their own request
+            if tokens >= SMALL_NODE_TOKENS or tokens < MIN_COMPRESS_TOKENS:
+                large.append(node)
+                continue
+            if current and (current_tokens + tokens > PACK_BUDGET_TOKENS
+                            or len(current) >= PACK_MAX_NODES
+                            or current[-1].get('ancestor') != node.get('ancestor')):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(node)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups, large
+
+    async def _abatch(
+        self,
+        nodes: list[Dict[str, Any]],
+        target_ratio: Optional[float],
+        max_concurrency: int
+    ) -> list[BatchItem]:
+        """Fan out node compressions on one event loop."""
+        import asyncio
+
+        if target_ratio is None:
+            target_ratio = self.default_ratio
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        groups, singles = self._pack_groups(nodes)
+
+        async def bounded_single(node):
+            async with semaphore:
+                try:
+                    result = await self._acompress_node(
+                        node['content'], target_ratio,
+                        ancestor_context=node.get('ancestor')
+                    )
+                    return [BatchItem(node['node_id'], result=result)]
+                except Exception as e:
+                    return [BatchItem(node['node_id'], error=str(e))]
+
+        async def bounded_group(group):
+            async with semaphore:
+                try:
+                    return await self._acompress_packed(group, target_ratio)
+                except Exception as e:
+                    return [
+                        BatchItem(node['node_id'], error=str(e))
+                        for node in group
+                    ]
+
+        tasks = [bounded_single(node) for node in singles]
+        tasks += [
+            bounded_single(group[0]) if len(group) == 1 else bounded_group(group)
+            for group in groups
+        ]
+        outcomes = await asyncio.gather(*tasks)
+
+        # Flatten and restore input order
+        by_id = {
+            entry.node_id: entry
+            for outcome in outcomes
+            for entry in outcome
+        }
+        return [by_id[node['node_id']] for node in nodes]
+
     def compress_batch(
         self,
         nodes: list[Dict[str, Any]],
         target_ratio: Optional[float] = None,
         max_concurrency: int = 5
-    ) -> list[CompressionResult]:
+    ) -> list[BatchItem]:
         """
         Compress multiple nodes in parallel.
 
+        Network-bound fan-out runs on an asyncio event loop rather than
+        a thread pool: no per-task thread stack or context switching, so
+        max_concurrency can safely be raised well beyond thread-pool
+        sizes for bulk session compression.
+
         Args:
             nodes: List of dicts with 'node_id' and 'content'
             target_ratio: Compression ratio
-            max_concurrency: Max parallel compressions
+            max_concurrency: Max in-flight API calls
 
         Returns:
-            List of CompressionResult objects
+            List of BatchItem, one per node, with result or error set
         """
-        import concurrent.futures
+        import asyncio
 
-        results = []
+        if BACKENDS.get(self.model, "remote") == "process":
+            return self._process_batch(nodes, target_ratio, max_concurrency)
+        return asyncio.run(self._abatch(nodes, target_ratio, max_concurrency))
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
-            futures = {
-                executor.submit(
-                    self.compress_node,
-                    node['content'],
-                    target_ratio
-                ): node['node_id']
+    def _process_batch(
+        self,
+        nodes: list[Dict[str, Any]],
+        target_ratio: Optional[float],
+        max_concurrency: int
+    ) -> list[BatchItem]:
+        """Fan out across worker processes for local-model backends."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = [
+                pool.submit(
+                    _process_worker,
+                    self.model, self.default_ratio, node, target_ratio
+                )
                 for node in nodes
-            }
-
-            for future in concurrent.futures.as_completed(futures):
-                node_id = futures[future]
-                try:
-                    result = future.result()
-                    results.append({
-                        'node_id': node_id,
-                        'result': result
-                    })
-                except Exception as e:
-                    results.append({
-                        'node_id': node_id,
-                        'error': str(e)
-                    })
-
-        return results
+            ]
+            return [future.result() for future in futures]
 
 
 # ============================================================================
@@ -242,12 +845,19 @@ def auto_compress_node(
     if not node:
         raise ValueError(f"Node not found: {node_id}")
 
-    # Skip if already compressed
-    if node.summary and not force:
-        return False
+    # Skip if already compressed — and on --force, skip anyway when the
+    # content hash matches the stored one (nothing changed, the existing
+    # summary is still valid)
+    content_hash = _content_hash(node.content)
+    if node.summary:
+        if not force:
+            return False
+        stored_hash = (node.metadata or {}).get('compression', {}).get('content_hash')
+        if stored_hash == content_hash:
+            return False
 
     # Compress
-    summarizer = NodeSummarizer()
+    summarizer = NodeSummarizer.get()
     result = summarizer.compress_node(node.content)
 
     # Update node
@@ -260,7 +870,8 @@ def auto_compress_node(
             'compression': {
                 'original_tokens': result.original_tokens,
                 'summary_tokens': result.summary_tokens,
-                'compression_time_ms': result.compression_time_ms
+                'compression_time_ms': result.compression_time_ms,
+                'content_hash': content_hash
             }
         }
     )
@@ -286,11 +897,30 @@ def compress_session_nodes(
     Returns:
         Summary statistics
     """
-    # Get nodes to compress
-    all_nodes = state_manager.get_session_got_nodes(session_id)
+    def needs_compression(node) -> bool:
+        if not node.summary:
+            return True
+        if not force:
+            return False
+        # Forced rerun: only recompress if the content actually changed
+        stored_hash = (node.metadata or {}).get('compression', {}).get('content_hash')
+        return stored_hash != _content_hash(node.content)
+
+    # Push the depth/summary predicate into the store query when the
+    # StateManager supports it: already-compressed nodes are then never
+    # read from the DB or materialized at all. Forced runs still fetch
+    # everything at depth, since they need stored hashes to compare
+    try:
+        all_nodes = state_manager.get_session_got_nodes(
+            session_id, min_depth=min_depth, needs_compression=not force
+        )
+    except TypeError:
+        # Older StateManager: fetch everything, filter in Python
+        all_nodes = state_manager.get_session_got_nodes(session_id)
+
     nodes_to_compress = [
         node for node in all_nodes
-        if node.depth >= min_depth and (force or not node.summary)
+        if node.depth >= min_depth and needs_compression(node)
     ]
 
     if not nodes_to_compress:
@@ -301,36 +931,83 @@ def compress_session_nodes(
             'compression_ratio': 'N/A (no nodes to compress)'
         }
 
-    # Batch compress
-    summarizer = NodeSummarizer()
+    # Batch compress; siblings carry their parent's summary as shared
+    # ancestor context so the provider prefix-caches it across the group
+    parent_summaries: Dict[str, Optional[str]] = {}
+    for node in nodes_to_compress:
+        parent_id = getattr(node, 'parent_id', None)
+        if parent_id and parent_id not in parent_summaries:
+            parent = state_manager.get_got_node(parent_id)
+            parent_summaries[parent_id] = (
+                parent.summary if parent and parent.summary else None
+            )
+
+    summarizer = NodeSummarizer.get()
     results = summarizer.compress_batch([
-        {'node_id': node.node_id, 'content': node.content}
+        {
+            'node_id': node.node_id,
+            'content': node.content,
+            'ancestor': parent_summaries.get(getattr(node, 'parent_id', None))
+        }
         for node in nodes_to_compress
     ])
 
-    # Update nodes
-    total_tokens_saved = 0
+    # Collect updates and accumulate metrics in one pass, then write all
+    # node updates in a single store transaction instead of one DB
+    # round-trip per node
+    nodes_by_id = {node.node_id: node for node in nodes_to_compress}
+    updates = []
+    total_original = 0
+    total_summary = 0
     successful = 0
 
     for item in results:
-        if 'error' in item:
+        if item.error:
             continue
 
-        result = item['result']
-        state_manager.update_got_node(
-            item['node_id'],
-            summary=result.summary,
-            compression_ratio=result.actual_ratio
-        )
+        result = item.result
+        node = nodes_by_id[item.node_id]
+        updates.append({
+            'node_id': item.node_id,
+            'summary': result.summary,
+            'compression_ratio': result.actual_ratio,
+            'metadata': {
+                **(node.metadata or {}),
+                'compression': {
+                    'original_tokens': result.original_tokens,
+                    'summary_tokens': result.summary_tokens,
+                    'compression_time_ms': result.compression_time_ms,
+                    'content_hash': _content_hash(node.content)
+                }
+            }
+        })
 
-        total_tokens_saved += (result.original_tokens - result.summary_tokens)
+        total_original += result.original_tokens
+        total_summary += result.summary_tokens
         successful += 1
 
+    bulk_update = getattr(state_manager, 'update_got_nodes_bulk', None)
+    if bulk_update is not None:
+        bulk_update(updates)
+    else:
+        # Older StateManager without the bulk API: fall back to per-node
+        # updates
+        for update in updates:
+            state_manager.update_got_node(
+                update['node_id'],
+                summary=update['summary'],
+                compression_ratio=update['compression_ratio'],
+                metadata=update['metadata']
+            )
+
     return {
         'compressed': successful,
         'failed': len(results) - successful,
-        'total_tokens_saved': total_tokens_saved,
-        'compression_ratio': f"{(1 - (sum(r['result'].summary_tokens for r in results if 'result' in r) / sum(r['result'].original_tokens for r in results if 'result' in r))):.1%}"
+        'total_tokens_saved': total_original - total_summary,
+        'compression_ratio': (
+            f"{(1 - total_summary / total_original):.1%}"
+            if total_original > 0 else 'N/A'
+        )
     }
 
 
@@ -338,7 +1015,7 @@ def compress_session_nodes(
 # CLI Interface
 # ============================================================================
 
-if __name__ == "__main__":
+def _main():
     import argparse
     import sys
     from pathlib import Path
@@ -361,7 +1038,16 @@ if __name__ == "__main__":
 
     try:
         if args.node_id:
-            # Single node compression
+            # Resolve the node before any summarizer/client setup: the
+            # already-compressed case costs one DB read and exits
+            node = sm.get_got_node(args.node_id)
+            if not node:
+                print(f"Node not found: {args.node_id}")
+                sys.exit(1)
+            if node.summary and not args.force:
+                print("✓ Already compressed (use --force to recompress)")
+                return
+
             print(f"Compressing node {args.node_id}...")
             success = auto_compress_node(sm, args.node_id, force=args.force)
 
@@ -370,7 +1056,7 @@ if __name__ == "__main__":
                 print(f"✓ Compressed successfully")
                 print(f"  Compression ratio: {node.compression_ratio:.1%}")
             else:
-                print("✓ Already compressed (use --force to recompress)")
+                print("✓ Already compressed (content unchanged)")
 
         else:
             # Session-wide compression
@@ -390,3 +1076,7 @@ if __name__ == "__main__":
 
     finally:
         sm.close()
+
+
+if __name__ == "__main__":
+    _main()
@@ -16,14 +16,19 @@ Output:
     JSON status with token savings
 """
 
+import atexit
 import sys
 import os
 import json
+import mmap
 import re
+import threading
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
 
     HAS_BS4 = True
 except ImportError:
@@ -50,10 +55,78 @@ try:
 except ImportError:
     HAS_STATE_MANAGER = False
 
+try:
+    import ahocorasick
+
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Optional fast JSON writer; stdlib json with indent is pure-Python-heavy
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer lxml's C parser when available; html.parser is pure Python and
+# dominates CPU time on large scraped pages.
+try:
+    import lxml  # noqa: F401
+
+    _BS4_PARSER = "lxml"
+except ImportError:
+    _BS4_PARSER = "html.parser"
+
 
 # Global fingerprint registry for deduplication (in-memory across processing)
 _FINGERPRINT_REGISTRY = {}
 
+# Banded LSH index over the registry; built lazily alongside the manifest load
+_BAND_INDEX = None
+
+# Manifest write-back state: inserts only mark the registry dirty, and the
+# manifest is written once at process exit (or explicitly after a batch)
+# instead of being rewritten on every insert.
+_MANIFEST_PATH = None
+_MANIFEST_DIRTY = False
+
+
+def _dump_json(payload: dict, path) -> None:
+    """Write indented JSON to a file, via orjson when available."""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+
+def _mark_manifest_dirty() -> None:
+    """Record a pending registry change and arm the exit-time flush."""
+    global _MANIFEST_PATH, _MANIFEST_DIRTY
+    if _MANIFEST_PATH is None:
+        _MANIFEST_PATH = (
+            Path.cwd() / "RESEARCH" / "current" / "content_fingerprints.json"
+        )
+        atexit.register(_flush_fingerprint_manifest)
+    _MANIFEST_DIRTY = True
+
+
+def _flush_fingerprint_manifest() -> None:
+    """Write the in-memory fingerprint registry back to its manifest file."""
+    global _MANIFEST_DIRTY
+    if not _MANIFEST_DIRTY or _MANIFEST_PATH is None:
+        return
+    try:
+        _MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        if orjson is not None:
+            _MANIFEST_PATH.write_bytes(orjson.dumps(_FINGERPRINT_REGISTRY))
+        else:
+            with open(_MANIFEST_PATH, "w") as f:
+                json.dump(_FINGERPRINT_REGISTRY, f)
+        _MANIFEST_DIRTY = False
+    except Exception as e:
+        print(f"Warning: Failed to write fingerprint manifest: {e}", file=sys.stderr)
+
 # Entity extraction patterns
 ENTITY_PATTERNS = {
     "company": [
@@ -103,6 +176,281 @@ RELATION_PATTERNS = {
     ],
 }
 
+def _fuse_patterns(patterns: list, binary: bool = False) -> tuple:
+    """Combine a list of patterns into one alternation regex.
+
+    Each pattern becomes a named alternative ``(?P<g{i}>...)`` so a single
+    finditer pass scans the text once instead of once per pattern. Returns
+    ``(compiled, capture_base)`` where ``capture_base`` maps each alternative's
+    group name to the group number of its first inner capture (the alternative's
+    own group number if it has no inner captures).
+
+    Dispatch on ``match.lastgroup`` to recover which alternative fired.
+    When ``binary`` is true the fused pattern is compiled over bytes — the
+    matcher skips per-character Unicode handling, which is measurably faster
+    on the ASCII-heavy text this pipeline sees.
+    """
+    alternatives = []
+    capture_base = {}
+    group_number = 1
+    for i, pattern in enumerate(patterns):
+        name = f"g{i}"
+        alternatives.append(f"(?P<{name}>{pattern})")
+        inner_groups = re.compile(pattern, re.IGNORECASE).groups
+        capture_base[name] = group_number + 1 if inner_groups else group_number
+        group_number += 1 + inner_groups
+    fused = "|".join(alternatives)
+    if binary:
+        # latin-1 keeps one byte per char for the few non-ASCII pattern chars
+        # (e.g. the middle dot in DALL·E); those bytes never occur in the
+        # ASCII-only haystacks this path handles, matching str semantics.
+        return re.compile(fused.encode("latin-1"), re.IGNORECASE), capture_base
+    return re.compile(fused, re.IGNORECASE), capture_base
+
+
+def _literal_keywords(pattern: str):
+    """Return the literal alternatives of a ``\\b(a|b|c)\\b`` pattern.
+
+    Returns None if the pattern contains any regex constructs beyond plain
+    alternation, meaning it must stay on the regex path.
+    """
+    if not (pattern.startswith(r"\b(") and pattern.endswith(r")\b")):
+        return None
+    body = pattern[3:-3]
+    if re.search(r"[\\()\[\]?*+{}.^$]", body):
+        return None
+    return body.split("|")
+
+
+def _build_entity_matchers() -> tuple:
+    """Split entity patterns into a keyword automaton and structural regexes.
+
+    Most entity patterns are plain literal alternations (company names, model
+    names, people). When pyahocorasick is available those literals go into one
+    Aho-Corasick automaton that matches every keyword in a single O(len(text))
+    pass; only the truly structural patterns ("X Inc.", "X Market") remain as
+    fused regexes. Without pyahocorasick everything stays on the fused-regex
+    path.
+
+    Returns ``(automaton_or_None, fused_str_by_type, fused_bytes_by_type)``.
+    """
+    if HAS_AHOCORASICK:
+        automaton = ahocorasick.Automaton()
+        regex_patterns = {}
+        for entity_type, patterns in ENTITY_PATTERNS.items():
+            for pattern in patterns:
+                keywords = _literal_keywords(pattern)
+                if keywords is None:
+                    regex_patterns.setdefault(entity_type, []).append(pattern)
+                else:
+                    for keyword in keywords:
+                        automaton.add_word(keyword.lower(), (entity_type, len(keyword)))
+        automaton.make_automaton()
+    else:
+        automaton = None
+        regex_patterns = ENTITY_PATTERNS
+
+    fused_str = {
+        entity_type: _fuse_patterns(patterns)
+        for entity_type, patterns in regex_patterns.items()
+    }
+    fused_bytes = {
+        entity_type: _fuse_patterns(patterns, binary=True)
+        for entity_type, patterns in regex_patterns.items()
+    }
+    return automaton, fused_str, fused_bytes
+
+
+# Built once at import time: the extractors run per document, and scanning the
+# text once per pattern (or re-compiling inside those loops) is the dominant
+# regex cost. Literal keywords match via one automaton sweep when available;
+# one alternation per entity/relation type covers the rest inside the C matcher.
+# The bytes twins drive the ASCII fast path (byte offsets == char offsets).
+_KEYWORD_AUTOMATON, _FUSED_ENTITY_PATTERNS, _FUSED_ENTITY_PATTERNS_BYTES = (
+    _build_entity_matchers()
+)
+
+_FUSED_RELATION_PATTERNS = {
+    relation_type: _fuse_patterns(patterns)
+    for relation_type, patterns in RELATION_PATTERNS.items()
+}
+
+_FUSED_RELATION_PATTERNS_BYTES = {
+    relation_type: _fuse_patterns(patterns, binary=True)
+    for relation_type, patterns in RELATION_PATTERNS.items()
+}
+
+
+def _build_probe():
+    """Build the screening regex for :func:`_has_entity_triggers`.
+
+    With the keyword automaton present, only the structural patterns need a
+    regex (literals are probed through the automaton); otherwise every entity
+    pattern folds into one alternation searched once.
+    """
+    if _KEYWORD_AUTOMATON is not None:
+        patterns = [
+            pattern
+            for pattern_list in ENTITY_PATTERNS.values()
+            for pattern in pattern_list
+            if _literal_keywords(pattern) is None
+        ]
+    else:
+        patterns = [
+            pattern
+            for pattern_list in ENTITY_PATTERNS.values()
+            for pattern in pattern_list
+        ]
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+_PROBE_RE = _build_probe()
+
+
+def _has_entity_triggers(text: str) -> bool:
+    """Cheap screen: could this text contain any extractable entity at all?
+
+    Most scraped pages contain none of the target entities; one search pass
+    that bails on the first hit is far cheaper than running the full
+    extraction pipeline just to produce an empty result. May report false
+    positives (the extractors validate properly) but never false negatives.
+    """
+    if _KEYWORD_AUTOMATON is not None and next(
+        _KEYWORD_AUTOMATON.iter(text.lower()), None
+    ) is not None:
+        return True
+    return _PROBE_RE is not None and _PROBE_RE.search(text) is not None
+
+# Common ad/nav class and id name fragments removed during HTML cleaning
+_AD_PATTERNS = [
+    "ad",
+    "ads",
+    "advertisement",
+    "banner",
+    "sidebar",
+    "nav",
+    "navigation",
+    "menu",
+    "footer",
+    "header",
+    "popup",
+    "modal",
+    "overlay",
+    "cookie",
+    "newsletter",
+    "social",
+    "share",
+    "comment",
+    "related",
+    "recommended",
+]
+
+# One alternation instead of one regex per fragment: clean_html walks the tree
+# once with this instead of 2x len(_AD_PATTERNS) find_all passes.
+_AD_RE = re.compile("|".join(_AD_PATTERNS), re.I)
+
+# Whitespace normalization for cleaned text: collapse space/tab runs and cap
+# consecutive blank lines
+_WS_RE = re.compile(r"[ \t]+")
+_NL_RE = re.compile(r"\n{3,}")
+
+# HTML content sniff for files without an .html/.htm extension
+_HTML_SNIFF_RE = re.compile(r"<html", re.I)
+
+# One configured converter per thread instead of construct-and-configure per
+# document (HTML2Text instances are not thread-safe)
+_H2T_LOCAL = threading.local()
+
+
+def _get_html2text():
+    """Return this thread's configured HTML2Text converter."""
+    converter = getattr(_H2T_LOCAL, "converter", None)
+    if converter is None:
+        converter = html2text.HTML2Text()
+        converter.ignore_links = False
+        converter.ignore_images = True
+        converter.ignore_emphasis = False
+        converter.body_width = 0  # Don't wrap lines
+        converter.unicode_snob = True
+        converter.skip_internal_links = True
+        converter.inline_links = True
+        _H2T_LOCAL.converter = converter
+    return converter
+
+
+# Interference elements removed wholesale regardless of class/id
+_REMOVE_TAGS = frozenset(
+    [
+        "script",
+        "style",
+        "nav",
+        "footer",
+        "header",
+        "aside",
+        "iframe",
+        "noscript",
+        "form",
+        "button",
+        "input",
+        "select",
+        "textarea",
+        "svg",
+        "canvas",
+        "advertisement",
+        "ad",
+        "banner",
+        "popup",
+        "modal",
+        # title/meta survive the content strainer for metadata extraction but
+        # have lost their <head> wrapper, so they must be dropped here or the
+        # page title gets rendered into the body text
+        "title",
+        "meta",
+    ]
+)
+
+
+def _is_removable_element(tag) -> bool:
+    """True if a tag is an interference element or an ad/nav-named container."""
+    if tag.name in _REMOVE_TAGS:
+        return True
+    classes = tag.get("class")
+    if classes and any(_AD_RE.search(c) for c in classes):
+        return True
+    element_id = tag.get("id")
+    return bool(element_id and _AD_RE.search(element_id))
+
+
+def _record_entity(entities: dict, name: str, entity_type: str) -> None:
+    """Record one entity mention, normalizing the name and tracking aliases."""
+    name = name.strip()
+
+    # Skip very short or generic matches
+    if len(name) < 2 or name.lower() in ["the", "a", "an", "is", "are"]:
+        return
+
+    # Normalize name; intern so the millions of repeated mentions in a large
+    # corpus share one string object and hash by identity
+    normalized = sys.intern(name.title() if len(name) > 3 else name.upper())
+
+    entity = entities.get(normalized)
+    if entity is None:
+        entity = entities[normalized] = {
+            "name": normalized,
+            "type": entity_type,
+            "aliases": None,  # allocated lazily on first alias
+            "mention_count": 0,
+        }
+
+    entity["mention_count"] += 1
+    if name != normalized:
+        if entity["aliases"] is None:
+            entity["aliases"] = {name}
+        else:
+            entity["aliases"].add(name)
+
 
 def extract_entities(text: str) -> dict:
     """Extract named entities from text using pattern matching.
@@ -114,38 +462,39 @@ def extract_entities(text: str) -> dict:
         Dictionary with entities by type and mention counts
     """
     entities = {}
-    mention_counts = {}
-
-    for entity_type, patterns in ENTITY_PATTERNS.items():
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Handle tuple matches from groups
-                name = match if isinstance(match, str) else match[0]
-                name = name.strip()
-
-                # Skip very short or generic matches
-                if len(name) < 2 or name.lower() in ["the", "a", "an", "is", "are"]:
-                    continue
-
-                # Normalize name
-                normalized = name.title() if len(name) > 3 else name.upper()
-
-                if normalized not in entities:
-                    entities[normalized] = {
-                        "name": normalized,
-                        "type": entity_type,
-                        "aliases": set(),
-                        "mention_count": 0,
-                    }
 
-                entities[normalized]["mention_count"] += 1
-                if name != normalized:
-                    entities[normalized]["aliases"].add(name)
+    if _KEYWORD_AUTOMATON is not None:
+        # Single automaton sweep over the literal keywords. The automaton
+        # matches substrings, so re-check word boundaries before recording.
+        lowered = text.lower()
+        last = len(lowered) - 1
+        for end, (entity_type, length) in _KEYWORD_AUTOMATON.iter(lowered):
+            start = end - length + 1
+            if start > 0 and (lowered[start - 1].isalnum() or lowered[start - 1] == "_"):
+                continue
+            if end < last and (lowered[end + 1].isalnum() or lowered[end + 1] == "_"):
+                continue
+            _record_entity(entities, text[start:end + 1], entity_type)
+
+    if text.isascii():
+        # Bytes matching skips the matcher's per-character Unicode handling;
+        # ASCII guarantees byte offsets equal character offsets, so captured
+        # spans can slice the original str directly.
+        data = text.encode("ascii")
+        for entity_type, (pattern, capture_base) in _FUSED_ENTITY_PATTERNS_BYTES.items():
+            for match in pattern.finditer(data):
+                start, end = match.span(capture_base[match.lastgroup])
+                _record_entity(entities, text[start:end], entity_type)
+    else:
+        for entity_type, (pattern, capture_base) in _FUSED_ENTITY_PATTERNS.items():
+            for match in pattern.finditer(text):
+                _record_entity(
+                    entities, match.group(capture_base[match.lastgroup]), entity_type
+                )
 
     # Convert sets to lists for JSON serialization
     for entity in entities.values():
-        entity["aliases"] = list(entity["aliases"])
+        entity["aliases"] = list(entity["aliases"]) if entity["aliases"] else []
 
     return entities
 
@@ -162,41 +511,103 @@ def extract_relations(text: str, entities: dict) -> list:
     """
     relations = []
     entity_names = set(entities.keys())
+    # Lowered once here instead of once per regex match below
+    lower_names = [name.lower() for name in entity_names]
 
-    for relation_type, patterns in RELATION_PATTERNS.items():
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                groups = match.groups()
-                if len(groups) >= 2:
-                    source = groups[0].strip().title()
-                    target = groups[1].strip().title()
-
-                    # Only include if at least one is a known entity
-                    source_known = source in entity_names or any(
-                        source.lower() in e.lower() for e in entity_names
-                    )
-                    target_known = target in entity_names or any(
-                        target.lower() in e.lower() for e in entity_names
-                    )
+    if text.isascii():
+        fused = _FUSED_RELATION_PATTERNS_BYTES
+        haystack = text.encode("ascii")
+    else:
+        fused = _FUSED_RELATION_PATTERNS
+        haystack = text
+
+    for relation_type, (pattern, capture_base) in fused.items():
+        for match in pattern.finditer(haystack):
+            base = capture_base[match.lastgroup]
+            if match.group(base) is None or match.group(base + 1) is None:
+                continue
+            # Spans index the original str in both cases (ASCII fast path)
+            source_span = match.span(base)
+            target_span = match.span(base + 1)
+            source = text[source_span[0]:source_span[1]].strip().title()
+            target = text[target_span[0]:target_span[1]].strip().title()
+
+            # Only include if at least one is a known entity
+            source_lower = source.lower()
+            target_lower = target.lower()
+            source_known = source in entity_names or any(
+                source_lower in lower for lower in lower_names
+            )
+            target_known = target in entity_names or any(
+                target_lower in lower for lower in lower_names
+            )
 
-                    if source_known or target_known:
-                        # Get context (surrounding text)
-                        start = max(0, match.start() - 50)
-                        end = min(len(text), match.end() + 50)
-                        evidence = text[start:end].strip()
+            if source_known or target_known:
+                # Get context (surrounding text)
+                start = max(0, match.start() - 50)
+                end = min(len(text), match.end() + 50)
+                evidence = text[start:end].strip()
 
-                        relations.append({
-                            "source": source,
-                            "target": target,
-                            "relation": relation_type,
-                            "evidence": evidence,
-                            "confidence": 0.7 if source_known and target_known else 0.5,
-                        })
+                relations.append({
+                    "source": source,
+                    "target": target,
+                    "relation": relation_type,
+                    "evidence": evidence,
+                    "confidence": 0.7 if source_known and target_known else 0.5,
+                })
 
     return relations
 
 
+def _find_entity_positions(text: str, entity_names: list) -> list:
+    """Locate every entity mention as ``(start, end, name)`` triples.
+
+    One Aho-Corasick sweep when pyahocorasick is available, otherwise a single
+    alternation regex pass — either way the text is scanned once instead of
+    once per entity name.
+    """
+    if not entity_names:
+        return []
+
+    if HAS_AHOCORASICK:
+        automaton = ahocorasick.Automaton()
+        for name in entity_names:
+            automaton.add_word(name.lower(), (len(name), name))
+        automaton.make_automaton()
+        return [
+            (end - length + 1, end + 1, name)
+            for end, (length, name) in automaton.iter(text.lower())
+        ]
+
+    canonical = {name.lower(): name for name in entity_names}
+    # Zero-width lookahead around the alternation so a short name embedded in
+    # a longer one still matches at its own position, like the automaton sweep
+    # does; longest-first so the capture at each position prefers the more
+    # specific name
+    joined = "(?=({}))".format(
+        "|".join(re.escape(name) for name in sorted(entity_names, key=len, reverse=True))
+    )
+    if text.isascii() and joined.isascii():
+        pattern = re.compile(joined.encode("ascii"), re.IGNORECASE)
+        return [
+            (
+                match.start(),
+                match.start() + len(match.group(1)),
+                canonical[match.group(1).decode("ascii").lower()],
+            )
+            for match in pattern.finditer(text.encode("ascii"))
+        ]
+    pattern = re.compile(joined, re.IGNORECASE)
+    return [
+        (
+            match.start(),
+            match.start() + len(match.group(1)),
+            canonical[match.group(1).lower()],
+        )
+        for match in pattern.finditer(text)
+    ]
+
+
 def extract_cooccurrences(text: str, entities: dict, window_size: int = 200) -> list:
     """Extract co-occurrences of entities within text windows.
 
@@ -211,27 +622,31 @@ def extract_cooccurrences(text: str, entities: dict, window_size: int = 200) ->
     cooccurrences = {}
     entity_names = list(entities.keys())
 
-    # Find all entity positions
-    entity_positions = []
-    for name in entity_names:
-        for match in re.finditer(re.escape(name), text, re.IGNORECASE):
-            entity_positions.append((match.start(), match.end(), name))
+    # Find all entity positions in a single pass over the text
+    entity_positions = _find_entity_positions(text, entity_names)
 
     # Sort by position
     entity_positions.sort(key=lambda x: x[0])
 
-    # Find co-occurrences within window
-    for i, (start_a, end_a, name_a) in enumerate(entity_positions):
-        for start_b, end_b, name_b in entity_positions[i + 1:]:
-            if start_b - end_a > window_size:
-                break
+    # Find co-occurrences within window. bisect bounds each inner slice to the
+    # positions actually inside the window, and integer-pair keys avoid sorting
+    # and hashing two strings per pair lookup.
+    name_to_id = {name: i for i, name in enumerate(entity_names)}
+    starts = [p[0] for p in entity_positions]
 
+    for i, (start_a, end_a, name_a) in enumerate(entity_positions):
+        hi = bisect_right(starts, end_a + window_size, lo=i + 1)
+        for start_b, end_b, name_b in entity_positions[i + 1:hi]:
             if name_a != name_b:
-                pair = tuple(sorted([name_a, name_b]))
+                id_a = name_to_id[name_a]
+                id_b = name_to_id[name_b]
+                # Packed small-int key: hashes to itself, no tuple allocation
+                pair = (id_a << 32) | id_b if id_a < id_b else (id_b << 32) | id_a
                 if pair not in cooccurrences:
+                    first, second = sorted([name_a, name_b])
                     cooccurrences[pair] = {
-                        "entity_a": pair[0],
-                        "entity_b": pair[1],
+                        "entity_a": first,
+                        "entity_b": second,
                         "count": 0,
                         "contexts": [],
                     }
@@ -277,23 +692,15 @@ def save_entity_extraction(
     edges_file = entity_graph_dir / "edges.json"
     cooccurrences_file = entity_graph_dir / "cooccurrences.json"
 
-    with open(entities_file, "w", encoding="utf-8") as f:
-        json.dump({
-            "session_id": session_id,
-            "entities": list(entities.values()),
-        }, f, indent=2, ensure_ascii=False)
-
-    with open(edges_file, "w", encoding="utf-8") as f:
-        json.dump({
-            "session_id": session_id,
-            "edges": relations,
-        }, f, indent=2, ensure_ascii=False)
-
-    with open(cooccurrences_file, "w", encoding="utf-8") as f:
-        json.dump({
-            "session_id": session_id,
-            "cooccurrences": cooccurrences,
-        }, f, indent=2, ensure_ascii=False)
+    _dump_json(
+        {"session_id": session_id, "entities": list(entities.values())},
+        entities_file,
+    )
+    _dump_json({"session_id": session_id, "edges": relations}, edges_file)
+    _dump_json(
+        {"session_id": session_id, "cooccurrences": cooccurrences},
+        cooccurrences_file,
+    )
 
     # Optionally save to database
     db_saved = False
@@ -388,9 +795,38 @@ def extract_tables(soup) -> list:
     return tables
 
 
-def clean_html(raw_html: str) -> str:
+# Tags the strainer builds tree nodes for: body (so direct text children and
+# any non-whitelisted content inside it survive — text nodes outside a matched
+# tag are dropped by the strainer), content containers for body-less fragments,
+# and the head elements metadata extraction needs. This only prunes head-level
+# junk at parse time; interference elements inside body are removed in
+# clean_soup's single traversal.
+_CONTENT_TAGS = [
+    "a", "article", "b", "blockquote", "body", "caption", "code", "dd",
+    "div", "dl", "dt", "em", "figcaption", "figure",
+    "h1", "h2", "h3", "h4", "h5", "h6", "i", "li", "main", "meta", "ol",
+    "p", "pre", "section", "span", "strong", "table", "td", "th",
+    "title", "tr", "ul",
+]
+
+_CONTENT_STRAINER = SoupStrainer(_CONTENT_TAGS) if HAS_BS4 else None
+
+
+def _make_soup(raw_html: str):
+    """Parse raw HTML once into a BeautifulSoup tree (lxml when available).
+
+    Parses through a SoupStrainer so head-level junk (scripts, styles, links)
+    never gets tree nodes; body content parses in full.
+    """
+    return BeautifulSoup(raw_html, _BS4_PARSER, parse_only=_CONTENT_STRAINER)
+
+
+def clean_html(raw_html: str) -> tuple:
     """Remove scripts, styles, navigation, keeping only core text content.
     Preserves tables by converting them to Markdown format.
+
+    Returns a ``(text, metadata)`` tuple; metadata is extracted from the same
+    parsed tree so the document is only parsed once.
     """
     if not HAS_BS4:
         # Fallback: basic regex cleaning if BeautifulSoup not available
@@ -412,92 +848,41 @@ def clean_html(raw_html: str) -> str:
         )
         text = re.sub(r"<[^>]+>", " ", text)
         text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        return text.strip(), {}
 
-    soup = BeautifulSoup(raw_html, "html.parser")
+    soup = _make_soup(raw_html)
 
-    # Extract tables FIRST before removing other elements
-    extracted_tables = extract_tables(soup)
+    # Pull metadata from the tree before <head> content is stripped below
+    metadata = extract_metadata(soup, "html")
 
-    # Remove interference elements
-    tags_to_remove = [
-        "script",
-        "style",
-        "nav",
-        "footer",
-        "header",
-        "aside",
-        "iframe",
-        "noscript",
-        "form",
-        "button",
-        "input",
-        "select",
-        "textarea",
-        "svg",
-        "canvas",
-        "advertisement",
-        "ad",
-        "banner",
-        "popup",
-        "modal",
-    ]
+    return clean_soup(soup), metadata
 
-    for tag in soup(tags_to_remove):
-        tag.extract()
 
-    # Remove elements by common ad/nav class names
-    ad_patterns = [
-        "ad",
-        "ads",
-        "advertisement",
-        "banner",
-        "sidebar",
-        "nav",
-        "navigation",
-        "menu",
-        "footer",
-        "header",
-        "popup",
-        "modal",
-        "overlay",
-        "cookie",
-        "newsletter",
-        "social",
-        "share",
-        "comment",
-        "related",
-        "recommended",
-    ]
+def clean_soup(soup) -> str:
+    """Strip interference elements from a parsed tree and convert it to text.
+
+    Destructive: tables and removed elements are extracted from the tree, so
+    pull any metadata before calling this.
+    """
+    # Extract tables FIRST before removing other elements
+    extracted_tables = extract_tables(soup)
 
-    for pattern in ad_patterns:
-        for element in soup.find_all(class_=re.compile(pattern, re.I)):
-            element.extract()
-        for element in soup.find_all(id=re.compile(pattern, re.I)):
-            element.extract()
+    # Remove interference elements and ad/nav-named containers in a single
+    # traversal: one find_all pass checks tag names and class/id together
+    for element in soup.find_all(_is_removable_element):
+        element.extract()
 
     # Use html2text if available for better Markdown conversion
     if HAS_HTML2TEXT:
-        h = html2text.HTML2Text()
-        h.ignore_links = False
-        h.ignore_images = True
-        h.ignore_emphasis = False
-        h.body_width = 0  # Don't wrap lines
-        h.unicode_snob = True
-        h.skip_internal_links = True
-        h.inline_links = True
-        text = h.handle(str(soup))
+        text = _get_html2text().handle(str(soup))
     else:
         # Fallback: Extract text with newlines
         text = soup.get_text(separator="\n")
 
-    # Clean whitespace
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = "\n".join(chunk for chunk in chunks if chunk)
-
-    # Remove excessive newlines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    # Clean whitespace in two C-level passes instead of per-line generators:
+    # collapse space/tab runs, then cap consecutive blank lines
+    text = _WS_RE.sub(" ", text)
+    text = _NL_RE.sub("\n\n", text).strip()
 
     # Append extracted tables at the end with section header
     if extracted_tables:
@@ -507,18 +892,12 @@ def clean_html(raw_html: str) -> str:
     return text
 
 
-def extract_metadata(soup_or_text, doc_type: str) -> dict:
-    """Extract metadata from document."""
+def extract_metadata(soup, doc_type: str) -> dict:
+    """Extract metadata from a parsed document tree."""
     metadata = {"title": "", "description": "", "author": "", "date": ""}
 
     if HAS_BS4 and doc_type == "html":
         try:
-            soup = (
-                BeautifulSoup(soup_or_text, "html.parser")
-                if isinstance(soup_or_text, str)
-                else soup_or_text
-            )
-
             # Title
             title_tag = soup.find("title")
             if title_tag:
@@ -551,28 +930,46 @@ def estimate_tokens(text: str) -> int:
     return len(text) // 4
 
 
-def _check_duplicate(url_or_path: str, content: str) -> dict:
-    """Check if content is duplicate using SimHash.
+_SIMHASH_CLASSES = None
 
-    Args:
-        url_or_path: URL or file path as identifier
-        content: Document content to check
 
-    Returns:
-        Dictionary with duplicate status and fingerprint
+def _load_simhash():
+    """Import SimHash lazily (more reliable than module-level import).
+
+    Returns ``(SimHash, SimHashIndex)`` or None when unavailable; the result
+    is cached after the first attempt.
     """
-    # Try to import SimHash at runtime (more reliable than module-level import)
+    global _SIMHASH_CLASSES
+    if _SIMHASH_CLASSES is not None:
+        return _SIMHASH_CLASSES or None
     try:
-        from scripts.simhash_dedup import SimHash
-
-        has_simhash = True
+        from scripts.simhash_dedup import SimHash, SimHashIndex
     except (ImportError, ModuleNotFoundError):
-        has_simhash = False
+        try:
+            from simhash_dedup import SimHash, SimHashIndex
+        except (ImportError, ModuleNotFoundError):
+            _SIMHASH_CLASSES = False
+            return None
+    _SIMHASH_CLASSES = (SimHash, SimHashIndex)
+    return _SIMHASH_CLASSES
 
-    if not has_simhash:
-        return {"is_duplicate": False, "fingerprint": None, "original_url": None}
 
-    global _FINGERPRINT_REGISTRY
+def _dedupe_fingerprint(url_or_path, fingerprint: int):
+    """Check a fingerprint against the registry, registering it if unique.
+
+    Args:
+        url_or_path: URL or file path identifying the document
+        fingerprint: Precomputed SimHash fingerprint
+
+    Returns:
+        The identifier of the near-duplicate original, or None if unique
+    """
+    loaded = _load_simhash()
+    if loaded is None:
+        return None
+    simhash_cls, index_cls = loaded
+
+    global _FINGERPRINT_REGISTRY, _BAND_INDEX
 
     if not _FINGERPRINT_REGISTRY:
         manifest_path = (
@@ -585,46 +982,75 @@ def _check_duplicate(url_or_path: str, content: str) -> dict:
             except Exception:
                 _FINGERPRINT_REGISTRY = {}
 
-    simhash = SimHash()
-    current_fingerprint = simhash.compute(content)
+    if _BAND_INDEX is None:
+        _BAND_INDEX = index_cls()
+        for url, fp in _FINGERPRINT_REGISTRY.items():
+            _BAND_INDEX.add(url, fp)
 
-    for existing_url, existing_fp in _FINGERPRINT_REGISTRY.items():
-        distance = simhash.hamming_distance(current_fingerprint, existing_fp)
+    # Only candidates sharing an LSH band can be within Hamming distance 3
+    simhash = simhash_cls()
+    for existing_url in _BAND_INDEX.candidates(fingerprint):
+        distance = simhash.hamming_distance(
+            fingerprint, _FINGERPRINT_REGISTRY[existing_url]
+        )
         if distance <= 3:
-            return {
-                "is_duplicate": True,
-                "fingerprint": current_fingerprint,
-                "original_url": existing_url,
-            }
+            return existing_url
+
+    # str() so Path identifiers serialize like the manifest's JSON keys
+    _FINGERPRINT_REGISTRY[str(url_or_path)] = fingerprint
+    _BAND_INDEX.add(str(url_or_path), fingerprint)
+    _mark_manifest_dirty()
+    return None
+
+
+def _check_duplicate(url_or_path: str, content: str) -> dict:
+    """Check if content is duplicate using SimHash.
 
-    _FINGERPRINT_REGISTRY[url_or_path] = current_fingerprint
-    manifest_path = Path.cwd() / "RESEARCH" / "current" / "content_fingerprints.json"
-    manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(manifest_path, "w") as f:
-        json.dump(_FINGERPRINT_REGISTRY, f)
+    Args:
+        url_or_path: URL or file path as identifier
+        content: Document content to check
+
+    Returns:
+        Dictionary with duplicate status and fingerprint
+    """
+    loaded = _load_simhash()
+    if loaded is None:
+        return {"is_duplicate": False, "fingerprint": None, "original_url": None}
+
+    current_fingerprint = loaded[0]().compute(content)
+    original_url = _dedupe_fingerprint(url_or_path, current_fingerprint)
 
     return {
-        "is_duplicate": False,
+        "is_duplicate": original_url is not None,
         "fingerprint": current_fingerprint,
-        "original_url": None,
+        "original_url": original_url,
     }
 
 
-def process_file(input_path: str) -> dict:
-    """Process a single file and return status."""
+def process_file(input_path: str, dedupe: bool = True) -> dict:
+    """Process a single file and return status.
+
+    Args:
+        input_path: File to process
+        dedupe: When False, compute the content fingerprint but skip the
+            shared duplicate registry — used by process_directory's worker
+            pool, where the parent reconciles duplicates afterward
+    """
     input_path = Path(input_path).resolve()
 
     if not input_path.exists():
         return {"error": f"File not found: {input_path}", "status": "failed"}
 
+    # Path anatomy computed once; reused for output, data dir, and session id
+    parts = input_path.parts
+    raw_idx = parts.index("raw") if "raw" in parts else -1
+    research_idx = parts.index("RESEARCH") if "RESEARCH" in parts else -1
+
     # Determine output path
     # Expected structure: RESEARCH/topic/data/raw/file.html -> RESEARCH/topic/data/processed/file_cleaned.md
-    try:
-        parts = input_path.parts
-        raw_idx = parts.index("raw")
-        base_parts = parts[:raw_idx]
-        processed_dir = Path(*base_parts) / "processed"
-    except ValueError:
+    if raw_idx >= 0:
+        processed_dir = Path(*parts[:raw_idx]) / "processed"
+    else:
         # Fallback: put processed file next to raw file
         processed_dir = input_path.parent.parent / "processed"
 
@@ -634,24 +1060,28 @@ def process_file(input_path: str) -> dict:
     name_without_ext = input_path.stem
     output_path = processed_dir / f"{name_without_ext}_cleaned.md"
 
-    # Read file
+    # Read file. Decoding straight from an mmap view skips the intermediate
+    # bytes copy a plain read() makes — it matters for multi-MB HTML pages.
     try:
-        with open(input_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
+        with open(input_path, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = str(mm, "utf-8", "ignore")
+            except ValueError:
+                # Empty files cannot be mapped
+                content = f.read().decode("utf-8", "ignore")
     except Exception as e:
         return {"error": f"Failed to read file: {e}", "status": "failed"}
 
     original_tokens = estimate_tokens(content)
 
-    # Determine document type and process
-    if (
-        input_path.suffix.lower() in [".html", ".htm"]
-        or "<html" in content[:500].lower()
-    ):
-        cleaned_text = clean_html(content)
+    # Determine document type and process. The sniff uses a bounded search on
+    # the original string instead of allocating a lowercased slice per file.
+    suffix = input_path.suffix.lower()
+    if suffix in (".html", ".htm") or _HTML_SNIFF_RE.search(content, 0, 512):
+        cleaned_text, metadata = clean_html(content)
         doc_type = "html"
-        metadata = extract_metadata(content, "html")
-    elif input_path.suffix.lower() == ".pdf":
+    elif suffix == ".pdf":
         # PDF processing would require additional libraries (PyPDF2, pdfplumber)
         # For now, just pass through
         cleaned_text = content
@@ -689,7 +1119,15 @@ date: {metadata.get("date", "")}
         return {"error": f"Failed to write file: {e}", "status": "failed"}
 
     # SimHash content deduplication
-    dedup_result = _check_duplicate(input_path, cleaned_text)
+    if dedupe:
+        dedup_result = _check_duplicate(input_path, cleaned_text)
+    else:
+        loaded = _load_simhash()
+        dedup_result = {
+            "is_duplicate": False,
+            "fingerprint": loaded[0]().compute(cleaned_text) if loaded else None,
+            "original_url": None,
+        }
     if dedup_result["is_duplicate"]:
         return {
             "status": "duplicate",
@@ -706,27 +1144,25 @@ date: {metadata.get("date", "")}
             "duplicate_of": dedup_result["original_url"],
         }
 
-    # Entity extraction
+    # Entity extraction (screened first: most pages contain no target entities)
     entity_result = None
     try:
-        entities = extract_entities(cleaned_text)
+        entities = (
+            extract_entities(cleaned_text)
+            if _has_entity_triggers(cleaned_text)
+            else {}
+        )
         if entities:
             relations = extract_relations(cleaned_text, entities)
             cooccurrences = extract_cooccurrences(cleaned_text, entities)
 
             # Determine data directory for entity graph output
-            try:
-                parts = input_path.parts
-                raw_idx = parts.index("raw")
-                data_dir = Path(*parts[:raw_idx])
-            except ValueError:
-                data_dir = processed_dir.parent
+            data_dir = Path(*parts[:raw_idx]) if raw_idx >= 0 else processed_dir.parent
 
             # Try to extract session_id from path (RESEARCH/<topic>/data/...)
-            try:
-                research_idx = parts.index("RESEARCH")
-                session_id = parts[research_idx + 1] if research_idx + 1 < len(parts) else "unknown"
-            except ValueError:
+            if 0 <= research_idx < len(parts) - 1:
+                session_id = parts[research_idx + 1]
+            else:
                 session_id = "unknown"
 
             entity_result = {
@@ -763,23 +1199,61 @@ date: {metadata.get("date", "")}
     }
 
 
-def process_directory(input_dir: str) -> list:
-    """Process all files in a directory."""
+def _process_file_worker(input_path: str) -> dict:
+    """Pool entry point: process one file without touching the shared registry."""
+    return process_file(input_path, dedupe=False)
+
+
+def process_directory(input_dir: str, max_workers: int = None) -> list:
+    """Process all files in a directory.
+
+    Files are independent CPU-bound work (parsing, regex, SimHash), so they
+    are fanned out across a process pool. Workers compute fingerprints but
+    skip the shared duplicate registry; the parent reconciles duplicates
+    afterward in input order so cross-file dedup stays consistent.
+    """
     input_path = Path(input_dir).resolve()
-    results = []
 
     if not input_path.is_dir():
         return [{"error": f"Not a directory: {input_dir}"}]
 
-    for file_path in input_path.glob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in [
-            ".html",
-            ".htm",
-            ".txt",
-            ".md",
-        ]:
-            result = process_file(str(file_path))
-            results.append(result)
+    file_paths = [
+        file_path
+        for file_path in sorted(input_path.glob("*"))
+        if file_path.is_file()
+        and file_path.suffix.lower() in [".html", ".htm", ".txt", ".md"]
+    ]
+
+    if len(file_paths) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(_process_file_worker, map(str, file_paths))
+            )
+    else:
+        results = [process_file(str(file_path), dedupe=False) for file_path in file_paths]
+
+    # Parent-side duplicate reconciliation against the shared registry
+    for i, result in enumerate(results):
+        fingerprint = result.get("content_hash")
+        if result.get("status") != "success" or fingerprint is None:
+            continue
+        original_url = _dedupe_fingerprint(result["input_path"], fingerprint)
+        if original_url:
+            results[i] = {
+                "status": "duplicate",
+                "original_url": original_url,
+                "input_path": result["input_path"],
+                "output_path": None,
+                "original_tokens": result["original_tokens"],
+                "cleaned_tokens": result["cleaned_tokens"],
+                "saved_tokens": result["saved_tokens"],
+                "savings_percent": result["savings_percent"],
+                "doc_type": result["doc_type"],
+                "duplicate_of": original_url,
+            }
+
+    # One manifest write for the whole batch instead of one per file
+    _flush_fingerprint_manifest()
 
     return results
 